@@ -0,0 +1,72 @@
+import itertools
+from typing import List, Optional
+
+import discord
+
+_ids = itertools.count(1)
+
+# 假 Interaction：記錄所有發送內容，唔會連去 Discord
+class FakeResponse:
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+        self.deferred = False
+
+    async def defer(self, **kwargs):
+        self.deferred = True
+
+    async def send_message(self, content: Optional[str] = None, **kwargs):
+        self._interaction.sent.append(content)
+
+    async def edit_message(self, content: Optional[str] = None, **kwargs):
+        self._interaction.sent.append(content)
+
+class FakeFollowup:
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        self._interaction.sent.append(content)
+
+class FakeInteraction:
+    def __init__(self, command=None, guild_id: int = 1, channel_id: int = 1):
+        self.id = next(_ids)
+        self.command = command
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.guild = None
+        self.channel = FakeChannel(channel_id)
+        self.created_at = discord.utils.utcnow()
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.sent: List[Optional[str]] = []
+
+# 假頻道同訊息：on_message / process_x_links 用
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.sent: List[Optional[str]] = []
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        self.sent.append(content)
+        return FakeMessage(content or '', self)
+
+class FakeAuthor:
+    bot = False
+
+class FakeMessage:
+    def __init__(self, content: str, channel: FakeChannel):
+        self.id = next(_ids)
+        self.content = content
+        self.channel = channel
+        self.guild = None
+        self.author = FakeAuthor()
+        self.created_at = discord.utils.utcnow()
+        self.edits = 0
+        self.replies: List[Optional[str]] = []
+
+    async def edit(self, **kwargs):
+        self.edits += 1
+
+    async def reply(self, content: Optional[str] = None, **kwargs):
+        self.replies.append(content)
+        return FakeMessage(content or '', self.channel)
@@ -0,0 +1,109 @@
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+# 英超球隊 (id, 名, shortName)
+PL_TEAMS = [
+    (57, 'Arsenal FC', 'Arsenal'), (58, 'Aston Villa FC', 'Aston Villa'), (61, 'Chelsea FC', 'Chelsea'),
+    (62, 'Everton FC', 'Everton'), (63, 'Fulham FC', 'Fulham'), (64, 'Liverpool FC', 'Liverpool'),
+    (65, 'Manchester City FC', 'Man City'), (66, 'Manchester United FC', 'Man United'),
+    (67, 'Newcastle United FC', 'Newcastle'), (73, 'Tottenham Hotspur FC', 'Tottenham'),
+    (76, 'Wolverhampton Wanderers FC', 'Wolverhampton'), (328, 'Burnley FC', 'Burnley'),
+    (341, 'Leeds United FC', 'Leeds United'), (351, 'Nottingham Forest FC', 'Nottingham'),
+    (354, 'Crystal Palace FC', 'Crystal Palace'), (397, 'Brighton & Hove Albion FC', 'Brighton Hove'),
+    (402, 'Brentford FC', 'Brentford'), (563, 'West Ham United FC', 'West Ham'),
+    (71, 'Sunderland AFC', 'Sunderland'), (1044, 'AFC Bournemouth', 'Bournemouth'),
+]
+COMPETITIONS = [('PL', 'Premier League'), ('PD', 'Primera Division'), ('BL1', 'Bundesliga'), ('SA', 'Serie A'), ('CL', 'UEFA Champions League')]
+RACES = [('Japanese Grand Prix', 'Japan'), ('Bahrain Grand Prix', 'Bahrain'), ('Saudi Arabian Grand Prix', 'Saudi Arabia'),
+         ('Miami Grand Prix', 'United States'), ('Monaco Grand Prix', 'Monaco'), ('Spanish Grand Prix', 'Spain'),
+         ('Canadian Grand Prix', 'Canada'), ('Austrian Grand Prix', 'Austria'), ('British Grand Prix', 'UK'),
+         ('Hungarian Grand Prix', 'Hungary'), ('Dutch Grand Prix', 'Netherlands'), ('Italian Grand Prix', 'Italy'),
+         ('Singapore Grand Prix', 'Singapore'), ('Mexico City Grand Prix', 'Mexico'), ('Qatar Grand Prix', 'Qatar'),
+         ('Abu Dhabi Grand Prix', 'United Arab Emirates')]
+
+def _iso(value: datetime) -> str:
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _match(match_id: int, kickoff: datetime, home, away, competition, status: str = 'TIMED') -> dict:
+    scored = status in ('IN_PLAY', 'PAUSED', 'FINISHED')
+    return {
+        'id': match_id,
+        'utcDate': _iso(kickoff),
+        'status': status,
+        'competition': {'code': competition[0], 'name': competition[1]},
+        'homeTeam': {'id': home[0], 'name': home[1], 'shortName': home[2]},
+        'awayTeam': {'id': away[0], 'name': away[1], 'shortName': away[2]},
+        'score': {'fullTime': {'home': random.randint(0, 3) if scored else None, 'away': random.randint(0, 3) if scored else None}},
+    }
+
+def _season_matches(now: datetime, competition=COMPETITIONS[0], rounds: int = 38) -> list:
+    matches = []
+    match_id = 500000
+    for round_no in range(rounds):
+        teams = PL_TEAMS[:]
+        random.Random(round_no).shuffle(teams)
+        kickoff = now + timedelta(days=7 * round_no - 70, hours=random.Random(round_no).randint(0, 48))
+        for i in range(0, len(teams), 2):
+            match_id += 1
+            matches.append(_match(match_id, kickoff + timedelta(hours=i // 4), teams[i], teams[i + 1], competition))
+    return matches
+
+# 生成模擬 football-data.org / Ergast 回應（冇錄音檔時用）
+def synthetic_payloads(now: Optional[datetime] = None) -> Dict[str, dict]:
+    now = now or datetime.now(timezone.utc)
+    season = _season_matches(now)
+    scheduled = [m for m in season if m['utcDate'] > _iso(now)]
+    today = []
+    for i in range(60):
+        competition = COMPETITIONS[i % len(COMPETITIONS)]
+        home, away = random.sample(PL_TEAMS, 2)
+        status = random.choice(['TIMED', 'IN_PLAY', 'PAUSED', 'FINISHED'])
+        today.append(_match(900000 + i, now + timedelta(minutes=15 * i - 300), home, away, competition, status))
+    standings = [{
+        'position': i + 1,
+        'team': {'id': team[0], 'name': team[1], 'shortName': team[2]},
+        'points': 60 - i * 3,
+        'playedGames': 20,
+    } for i, team in enumerate(PL_TEAMS)]
+    races = []
+    for i, (name, country) in enumerate(RACES):
+        day = now + timedelta(days=14 * i - 60)
+        races.append({
+            'round': str(i + 1),
+            'raceName': name,
+            'date': day.strftime('%Y-%m-%d'),
+            'time': '13:00:00Z',
+            'Circuit': {'Location': {'country': country}},
+            'Qualifying': {'date': (day - timedelta(days=1)).strftime('%Y-%m-%d'), 'time': '14:00:00Z'},
+        })
+    drivers = [('Max', 'Verstappen', 'Dutch'), ('Lando', 'Norris', 'British'), ('Charles', 'Leclerc', 'Monegasque'),
+               ('Oscar', 'Piastri', 'Australian'), ('Lewis', 'Hamilton', 'British'), ('George', 'Russell', 'British'),
+               ('Carlos', 'Sainz', 'Spanish'), ('Fernando', 'Alonso', 'Spanish'), ('Pierre', 'Gasly', 'French'),
+               ('Alexander', 'Albon', 'Thai'), ('Nico', 'Hulkenberg', 'German')]
+    driver_standings = [{
+        'position': str(i + 1),
+        'points': str(300 - i * 25),
+        'Driver': {'driverId': family.lower(), 'givenName': given, 'familyName': family, 'nationality': nationality},
+    } for i, (given, family, nationality) in enumerate(drivers)]
+    return {
+        'v4/matches': {'matches': today},
+        'v4/competitions/PL/matches?status=SCHEDULED': {'matches': scheduled},
+        'v4/competitions/PL/standings': {'standings': [{'type': 'TOTAL', 'table': standings}]},
+        'v4/teams/64/matches?status=SCHEDULED': {'matches': [m for m in scheduled if 64 in (m['homeTeam']['id'], m['awayTeam']['id'])]},
+        'ergast/f1/current.json': {'MRData': {'RaceTable': {'Races': races}}},
+        'ergast/f1/current/driverStandings.json': {'MRData': {'StandingsTable': {'StandingsLists': [{'DriverStandings': driver_standings}]}}},
+    }
+
+# 由目錄讀入錄音回應：檔名係路徑將 '/' 換成 '__'、'?' 換成 '@'，例如 v4__matches.json
+def load_recorded(directory: str) -> Dict[str, dict]:
+    payloads = {}
+    for filename in os.listdir(directory):
+        if not filename.endswith('.json'):
+            continue
+        key = filename[:-5].replace('__', '/').replace('@', '?')
+        with open(os.path.join(directory, filename), encoding='utf-8') as f:
+            payloads[key] = json.load(f)
+    return payloads
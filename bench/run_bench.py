@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench.payloads import load_recorded, synthetic_payloads
+from bench.stub_api import StubApi
+
+# 離線壓力測試：假 Discord + 本地假 API，量度命令同 x.com 連結處理嘅吞吐量、延遲同記憶體
+# 用法（喺 repo 根目錄）: python -m bench.run_bench --users 50 --duration 10
+
+# 模擬用戶會用嘅命令（bot.py 入面嘅函數名）
+COMMANDS = ['pl_schedule', 'pl_standings', 'pl_next', 'next_liverpool', 'today_matches', 'f1_schedule', 'f1_next', 'f1_standings']
+
+TWEET_TEMPLATES = [
+    "睇下呢個 https://x.com/{user}/status/{id}",
+    "https://twitter.com/{user}/status/{id} 同 https://x.com/{user}/status/{other}",
+    "冇連結嘅普通訊息",
+    "x.com 唔係連結",
+]
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Discord sport bot offline benchmark')
+    parser.add_argument('--users', type=int, default=20, help='同時發命令嘅用戶數')
+    parser.add_argument('--duration', type=float, default=10.0, help='測試秒數')
+    parser.add_argument('--think-time', type=float, default=0.05, help='每個用戶兩次命令之間嘅秒數')
+    parser.add_argument('--messages-per-sec', type=float, default=20.0, help='每秒幾多條聊天訊息（0 = 唔測 x.com）')
+    parser.add_argument('--latency', type=float, default=80.0, help='假 API 延遲（毫秒）')
+    parser.add_argument('--jitter', type=float, default=20.0, help='假 API 延遲抖動（毫秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='假 API 隨機回 429 嘅比例')
+    parser.add_argument('--quota', type=int, default=600, help='假 API 及 bot 每分鐘請求上限')
+    parser.add_argument('--cold', action='store_true', help='每次命令前清空回應快取')
+    parser.add_argument('--fixtures', help='錄音回應目錄（預設用生成資料）')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+# 喺 import bot 之前將所有檔案同上游指去臨時目錄 / 假 API
+def configure_environment(workdir: str, base_url: str, quota: int):
+    os.environ['DISCORD_TOKEN'] = 'bench'
+    os.environ.setdefault('FOOTBALL_API_KEY', 'bench')
+    os.environ['FOOTBALL_API_BASE'] = base_url + 'v4/'
+    os.environ['ERGAST_API_BASE'] = base_url + 'ergast/f1/'
+    os.environ['FOOTBALL_RATE_PER_MINUTE'] = str(quota)
+    os.environ['CACHE_DB'] = os.path.join(workdir, 'cache.sqlite3')
+    os.environ['LOG_FILE'] = os.path.join(workdir, 'bot.log')
+    os.environ['SUBSCRIPTIONS_FILE'] = os.path.join(workdir, 'subscriptions.json')
+    os.environ['LIVE_BOARDS_FILE'] = os.path.join(workdir, 'live_boards.json')
+    os.environ['GUILD_SETTINGS_FILE'] = os.path.join(workdir, 'guild_settings.json')
+    os.environ.pop('METRICS_PORT', None)
+
+def _percentiles(samples: list) -> str:
+    if not samples:
+        return '-'
+    ordered = sorted(samples)
+    p50, p95, p99 = (ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000 for q in (0.5, 0.95, 0.99))
+    return f"{p50:8.1f} {p95:8.1f} {p99:8.1f}"
+
+async def _user(bot, fakes, sports_api, args, deadline: float, results: dict, rng: random.Random):
+    while time.perf_counter() < deadline:
+        name = rng.choice(COMMANDS)
+        command = getattr(bot, name)
+        interaction = fakes.FakeInteraction(command=command, guild_id=rng.randint(1, 50), channel_id=rng.randint(1, 500))
+        if args.cold:
+            for key in list(sports_api.response_cache.keys()):
+                sports_api.response_cache.invalidate(key)
+        started = time.perf_counter()
+        try:
+            await command.callback(interaction)
+        except Exception as e:
+            results['errors'][name] = results['errors'].get(name, 0) + 1
+            results['last_error'] = repr(e)
+        results['commands'].setdefault(name, []).append(time.perf_counter() - started)
+        results['sent'] += len(interaction.sent)
+        if args.think_time:
+            await asyncio.sleep(args.think_time)
+
+async def _chatter(bot, fakes, args, deadline: float, results: dict, rng: random.Random):
+    if args.messages_per_sec <= 0:
+        return
+    interval = 1 / args.messages_per_sec
+    channels = [fakes.FakeChannel(i) for i in range(1, 21)]
+    pending = set()
+    while time.perf_counter() < deadline:
+        template = rng.choice(TWEET_TEMPLATES)
+        content = template.format(user=rng.choice(['user', 'BBCSport', 'premierleague', 'F1']),
+                                  id=rng.randint(10 ** 17, 10 ** 18), other=rng.randint(10 ** 17, 10 ** 18))
+        message = fakes.FakeMessage(content, rng.choice(channels))
+
+        async def handle(message=message):
+            started = time.perf_counter()
+            try:
+                await bot.on_message(message)
+            except Exception as e:
+                results['errors']['on_message'] = results['errors'].get('on_message', 0) + 1
+                results['last_error'] = repr(e)
+            results['messages'].append(time.perf_counter() - started)
+            results['replies'] += len(message.replies)
+
+        task = asyncio.ensure_future(handle())
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        await asyncio.sleep(interval)
+    if pending:
+        await asyncio.gather(*pending)
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    payloads = load_recorded(args.fixtures) if args.fixtures else synthetic_payloads()
+    stub = StubApi(payloads, latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate, quota_per_minute=args.quota)
+    base_url = await stub.start()
+    workdir = tempfile.mkdtemp(prefix='sportbot-bench-')
+    configure_environment(workdir, base_url, args.quota)
+
+    # 環境設定好先 import，bot 模組會讀環境變數
+    import bot
+    import cache_store
+    import http_client
+    import sports_api
+    from bench import fakes
+    http_client.HOST_LIMITS['127.0.0.1'] = max(http_client.HOST_LIMITS.values())
+
+    results = {'commands': {}, 'messages': [], 'errors': {}, 'sent': 0, 'replies': 0, 'last_error': None}
+    tracemalloc.start()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    try:
+        await asyncio.gather(
+            *(_user(bot, fakes, sports_api, args, deadline, results, random.Random(rng.random())) for _ in range(args.users)),
+            _chatter(bot, fakes, args, deadline, results, random.Random(rng.random())),
+        )
+    finally:
+        elapsed = time.perf_counter() - started
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        await http_client.close()
+        await stub.stop()
+        cache_store.close()
+    results.update(elapsed=elapsed, memory_current=current, memory_peak=peak,
+                   upstream_requests=stub.requests, upstream_throttled=stub.throttled,
+                   cache=sports_api.cache_stats(), quota=sports_api.quota_stats())
+    return results
+
+def report(args: argparse.Namespace, results: dict):
+    elapsed = results['elapsed']
+    total = sum(len(samples) for samples in results['commands'].values())
+    print(f"用戶 {args.users}  訊息/秒 {args.messages_per_sec}  延遲 {args.latency}±{args.jitter}ms  "
+          f"429 比例 {args.error_rate}  {'冷快取' if args.cold else '熱快取'}  {elapsed:.1f}s")
+    print(f"{'名稱':<18}{'次數':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name in sorted(results['commands']):
+        samples = results['commands'][name]
+        print(f"{name:<20}{len(samples):>8} {_percentiles(samples)}")
+    if results['messages']:
+        print(f"{'on_message':<20}{len(results['messages']):>8} {_percentiles(results['messages'])}")
+    print(f"命令吞吐量 {total / elapsed:.1f}/s  訊息吞吐量 {len(results['messages']) / elapsed:.1f}/s  "
+          f"發送 {results['sent']}  回覆 {results['replies']}")
+    print(f"上游請求 {results['upstream_requests']}（429: {results['upstream_throttled']}）  快取 {results['cache']}")
+    print(f"記憶體 現時 {results['memory_current'] / 1024:.0f} KiB  峰值 {results['memory_peak'] / 1024:.0f} KiB")
+    if results['errors']:
+        print(f"錯誤 {results['errors']}  最後: {results['last_error']}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    report(args, results)
+    return 1 if results['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import asyncio
+import random
+import time
+from typing import Dict
+
+from aiohttp import web
+
+# 本地假 football-data.org / Ergast：回放預先準備嘅回應，可加延遲同 429
+class StubApi:
+    def __init__(self, payloads: Dict[str, dict], latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, quota_per_minute: int = 100000):
+        self.payloads = payloads
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self.requests = 0
+        self.throttled = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._runner = None
+        self.base_url = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        now = time.monotonic()
+        if now - self._window_start >= 60:
+            self._window_start, self._window_count = now, 0
+        self._window_count += 1
+        reset = max(1, int(60 - (now - self._window_start)))
+        headers = {
+            'X-Requests-Available-Minute': str(max(0, self.quota_per_minute - self._window_count)),
+            'X-RequestCounter-Reset': str(reset),
+        }
+        if random.random() < self.error_rate or self._window_count > self.quota_per_minute:
+            self.throttled += 1
+            # 模擬 429 時只叫 bench 等 1 秒，唔係真係等成分鐘
+            headers['X-RequestCounter-Reset'] = '1'
+            return web.json_response({'message': 'rate limited'}, status=429, headers=headers)
+        key = request.path_qs.lstrip('/')
+        payload = self.payloads.get(key)
+        if payload is None:
+            return web.json_response({'message': f'no recorded payload for {key}'}, status=404, headers=headers)
+        return web.json_response(payload, headers=headers)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}/"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -1,367 +1,356 @@
 import os
 import discord
 from discord import app_commands
-import requests
+import asyncio
+import aiohttp
 from dotenv import load_dotenv
 from datetime import datetime, date
-import pytz
 import logging
+from typing import Optional
 from datetime import timedelta
+
+# 載入環境變量：要喺 import 本地模組之前，佢哋 import 時已經讀取設定（CACHE_DB、LOG_FILE 等）
+load_dotenv()
+
+import log_setup
 import twitter_handler
+import http_client
+import cache_store
+import sports_api
+import shared_cache
+import poller
+import live_notifier
+import live_board
+import query_engine
+import guild_settings
+import render
+import metrics
+from rate_limiter import RateLimited
+from models import HKT, TIME_FORMATS
 
 # 設置日誌
-logging.basicConfig(filename='bot.log', level=logging.INFO)
+log_setup.setup_logging(logging.INFO)
 
-# 載入環境變量
-load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
 FOOTBALL_API_KEY = os.getenv('FOOTBALL_API_KEY')
 
 # 設定bot，intent允許讀訊息
 intents = discord.Intents.default()
 intents.message_content = True
-bot = discord.Client(intents=intents)
+
+# 分片：SHARD_COUNT 設為數字或 auto 就用 AutoShardedClient，一個進程跑多個 gateway 連接
+# 多進程部署：每個進程用 SHARD_IDS（例如 0,1）指定負責嘅分片，並設定各自嘅
+# SUBSCRIPTIONS_FILE / LIVE_BOARDS_FILE / GUILD_SETTINGS_FILE / METRICS_PORT；上游資料同配額經 CACHE_DB 共用
+SHARD_COUNT = os.getenv('SHARD_COUNT')
+SHARD_IDS = os.getenv('SHARD_IDS')
+
+def _shard_options() -> dict:
+    options = {}
+    if SHARD_COUNT and SHARD_COUNT != 'auto':
+        options['shard_count'] = int(SHARD_COUNT)
+    if SHARD_IDS:
+        if 'shard_count' not in options:
+            raise ValueError("設定 SHARD_IDS 時必須同時設定 SHARD_COUNT")
+        options['shard_ids'] = [int(shard_id) for shard_id in SHARD_IDS.split(',') if shard_id.strip()]
+    return options
+
+_BaseClient = discord.AutoShardedClient if SHARD_COUNT or SHARD_IDS else discord.Client
+
+# 啟動時登記持久按鈕；關閉bot時一併停止背景預取同關閉共用HTTP連接池
+class SportBot(_BaseClient):
+    async def setup_hook(self):
+        twitter_handler.register_views(self)
+
+    async def close(self):
+        poller.stop()
+        metrics.stop_loop_monitor()
+        await metrics.stop_http_server()
+        await http_client.close()
+        # 等埋未寫完嘅快取快照先關資料庫，否則背景 thread 會寫入已關閉嘅連線
+        await sports_api.flush()
+        cache_store.close()
+        await super().close()
+
+bot = SportBot(intents=intents, **_shard_options())
 tree = app_commands.CommandTree(bot)
 
-# 國家旗幟映射
-COUNTRY_FLAGS = {
-    'England': '🇬🇧', 'Spain': '🇪🇸', 'Germany': '🇩🇪', 'Italy': '🇮🇹', 'France': '🇫🇷',
-    'Netherlands': '🇳🇱', 'Portugal': '🇵🇹', 'Belgium': '🇧🇪', 'Brazil': '🇧🇷', 'Argentina': '🇦🇷',
-    'Bahrain': '🇧🇭', 'Australia': '🇦🇺', 'China': '🇨🇳', 'Monaco': '🇲🇨', 'Canada': '🇨🇦',
-    'Austria': '🇦🇹', 'Hungary': '🇭🇺', 'Singapore': '🇸🇬', 'Japan': '🇯🇵', 'United States': '🇺🇸',
-    'Mexico': '🇲🇽', 'Qatar': '🇶🇦', 'United Arab Emirates': '🇦🇪', 'Saudi Arabia': '🇸🇦',
-    'British': '🇬🇧', 'Dutch': '🇳🇱', 'Spanish': '🇪🇸', 'Finnish': '🇫🇮', 'Mexican': '🇲🇽',
-    'Monegasque': '🇲🇨', 'Australian': '🇦🇺', 'Canadian': '🇨🇦', 'French': '🇫🇷', 'German': '🇩🇪',
-    'Italian': '🇮🇹', 'Thai': '🇹🇭', 'Azerbaijan': '🇦🇿' , 'USA': '🇺🇸'
-}
+# 由磁碟快照載入上次嘅回應，重啟後唔使等上游
+sports_api.load_persisted()
+# 各伺服器嘅時區同時間格式
+guild_settings.load()
+
+# 即時比賽推送：共用背景預取嘅 /v4/matches feed
+live_notifier.setup(bot)
+poller.add_listener('matches', live_notifier.on_live_update)
+live_board.setup(bot)
+poller.add_listener('matches', live_board.on_live_update)
+
+# /bot_stats 同 /metrics 顯示嘅快取同配額狀態
+metrics.add_gauge_source('response_cache', sports_api.cache_stats)
+metrics.add_gauge_source('football_quota', sports_api.quota_stats)
+metrics.add_gauge_source('render_cache', render.stats)
+metrics.add_gauge_source('tweet_variants', twitter_handler._variants.stats)
+metrics.add_gauge_source('tweet_dedup', twitter_handler._recent_links.stats)
+METRICS_PORT = os.getenv('METRICS_PORT')
 
 # 添加 on_message 事件
 @bot.event
 async def on_ready():
-    now = datetime.now(pytz.timezone('Asia/Hong_Kong'))
+    now = datetime.now(HKT)
     logging.info(f'{now}: {bot.user} 已連線到Discord!')
+    if bot.shard_count:
+        logging.info(f"{now}: 分片 {bot.shard_ids or list(range(bot.shard_count))} / 共 {bot.shard_count}，快取後端 {shared_cache.CACHE_BACKEND}")
     try:
         synced = await tree.sync()
         logging.info(f"{now}: 已同步 {len(synced)} 條斜線命令")
     except Exception as e:
         logging.error(f"{now}: 同步命令失敗: {e}")
+    # 背景預取賽程同積分榜
+    poller.start()
+    metrics.start_loop_monitor()
+    if METRICS_PORT:
+        try:
+            await metrics.start_http_server(int(METRICS_PORT))
+        except (OSError, ValueError) as e:
+            logging.error(f"無法開啟指標端點: {e}")
+
+# 記錄每個斜線命令嘅處理時間
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    latency = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    metrics.observe(f"command {command.qualified_name}", latency)
+    logging.info("斜線命令完成", extra={'command': command.qualified_name, 'guild': interaction.guild_id, 'latency_ms': round(latency * 1000)})
 
 @bot.event
 async def on_message(message: discord.Message):
     if message.author.bot:
         return
     
+    # 冇 x.com / twitter.com 字眼嘅訊息即刻略過
+    if not twitter_handler.might_contain_x_link(message.content):
+        return
     results = await twitter_handler.process_x_links(message)
     for result in results:
         if result and result['type'] == 'reply':
             await message.reply(**result['result'],mention_author=False)
+            # 由用戶發訊息到bot回覆嘅延遲
+            latency = (discord.utils.utcnow() - message.created_at).total_seconds()
+            metrics.observe('x_links.dispatch', latency)
+            logging.info("x.com 連結回覆", extra={'guild': message.guild.id if message.guild else None, 'latency_ms': round(latency * 1000)})
 
 
 
-# 英超球隊emoji（保留shortname and short name）
-TEAM_EMOJIS = {
-    'AFC Bournemouth': '<:bou:1404703461211115611> ',
-    'West Ham United FC': '<:wes:1404703431414780025> ',
-    'Brentford FC': '<:bre:1404703388310048799> ',
-    'Brighton & Hove Albion FC': '<:bri:1404703345079353395> ',
-    'Crystal Palace FC': '<:cry:1404703320974688318> ',
-    'Nottingham Forest FC': '<:not:1404703264510836807> ',
-    'Leeds United FC': '<:lee:1404703235821928499> ',
-    'Burnley FC': '<:bur:1404703096617304186> ',
-    'Wolverhampton Wanderers FC': '<:wol:1404703054913081487> ',
-    'Tottenham Hotspur FC': '<:tot:1404703032385474611> ',
-    'Sunderland AFC': '<:sun:1404702964354121824> ',
-    'Newcastle United FC': '<:new:1404702938030669834> ',
-    'Manchester United FC': '<:mu:1404702913787465739> ',
-    'Manchester City FC': '<:mc:1404702893444960286> ',
-    'Liverpool FC': '<:liv:1404702872259526707> ',
-    'Fulham FC': '<:ful:1404702776348377160> ',
-    'Everton FC': '<:eve:1404702731654008903> ',
-    'Chelsea FC': '<:che:1404702690570670104> ',
-    'Aston Villa FC': '<:ast:1404702655812735008> ',
-    'Arsenal FC': '<:ars:1404702558374858822> ',
-
-    'Bournemouth': '<:bou:1404703461211115611> ',
-    'West Ham': '<:wes:1404703431414780025> ',
-    'Brentford': '<:bre:1404703388310048799> ',
-    'Brighton Hove': '<:bri:1404703345079353395> ',
-    'Crystal Palace': '<:cry:1404703320974688318> ',
-    'Nottingham': '<:not:1404703264510836807> ',
-    'Leeds United': '<:lee:1404703235821928499> ',
-    'Burnley': '<:bur:1404703096617304186> ',
-    'Wolverhampton': '<:wol:1404703054913081487> ',
-    'Tottenham': '<:tot:1404703032385474611> ',
-    'Sunderland': '<:sun:1404702964354121824> ',
-    'Newcastle': '<:new:1404702938030669834> ',
-    'Man United': '<:mu:1404702913787465739> ',
-    'Man City': '<:mc:1404702893444960286> ',
-    'Liverpool': '<:liv:1404702872259526707> ',
-    'Fulham': '<:ful:1404702776348377160> ',
-    'Everton': '<:eve:1404702731654008903> ',
-    'Chelsea': '<:che:1404702690570670104> ',
-    'Aston Villa': '<:ast:1404702655812735008> ',
-    'Arsenal': '<:ars:1404702558374858822> '
-}
-
-# 聯賽國家emoji映射
-LEAGUE_EMOJI = {
-    'PL': '<:PL2:1406265845239255120>',  # Premier League
-    'PD': '<:laliga:1406264996429828136>',   # La Liga
-    'BL1': '<:BL1:1406264975172833341>',
-    'SA': '<:SA:1406265008265891930>'
-    # 若有其他聯賽，可加
-}
-
-# 將UTC轉為香港時間
-def to_hkt(utc_time_str):
+# 查詢結果分頁發送，統一處理上游錯誤
+async def send_query(interaction: discord.Interaction, build, denied: str, missing: str):
+    name = interaction.command.qualified_name if interaction.command else 'query'
     try:
-        utc_time = datetime.fromisoformat(utc_time_str.replace('Z', '+00:00'))
-        hkt_tz = pytz.timezone('Asia/Hong_Kong')
-        hkt_time = utc_time.astimezone(hkt_tz)
-        return hkt_time.strftime('%d/%m %H:%M')
-    except:
-        return "時間格式錯誤"
+        with metrics.timer(f"command {name}.build"):
+            pages = await build()
+        with metrics.timer(f"command {name}.send"):
+            for page in pages:
+                await interaction.followup.send(page)
+    except query_engine.QueryError as e:
+        await interaction.followup.send(f"⚠️ {e}")
+    except aiohttp.ClientResponseError as e:
+        metrics.increment('command_errors')
+        if e.status == 403:
+            await interaction.followup.send(f"⚠️ {denied}訪問被拒，請檢查API金鑰或訂閱權限。")
+        else:
+            await interaction.followup.send(f"⚠️ 無法搵到{missing}，請稍後再試。錯誤: {str(e)}")
+    except (aiohttp.ClientError, asyncio.TimeoutError, RateLimited) as e:
+        metrics.increment('command_errors')
+        await interaction.followup.send(f"⚠️ 無法搵到{missing}，請稍後再試。錯誤: {str(e)}")
+
+COMPETITION_CHOICES = [app_commands.Choice(name=name, value=code) for code, name in sports_api.COMPETITIONS.items()]
+
+# 球隊自動完成（用已快取嘅比賽同積分榜資料，唔使額外請求）
+async def team_autocomplete(interaction: discord.Interaction, current: str):
+    return [app_commands.Choice(name=name, value=value) for name, value in query_engine.team_choices(current)]
+
+# 任何聯賽／球隊賽程
+@tree.command(name="schedule", description="聯賽或球隊賽程")
+@app_commands.choices(competition=COMPETITION_CHOICES)
+@app_commands.autocomplete(team=team_autocomplete)
+async def schedule(interaction: discord.Interaction, competition: Optional[app_commands.Choice[str]] = None,
+                   team: Optional[str] = None, limit: app_commands.Range[int, 1, 25] = 10):
+    await interaction.response.defer()
+    code = competition.value if competition else None
+    await send_query(interaction, lambda: query_engine.schedule_pages(code, query_engine.resolve_team(team), limit, guild_settings.locale_for(interaction.guild_id)), "賽程", "賽程")
+
+# 任何聯賽積分榜
+@tree.command(name="standings", description="聯賽積分榜")
+@app_commands.choices(competition=COMPETITION_CHOICES)
+async def standings(interaction: discord.Interaction, competition: app_commands.Choice[str]):
+    await interaction.response.defer()
+    await send_query(interaction, lambda: query_engine.standings_pages(competition.value), "積分榜數據", "積分榜數據")
+
+# 球隊（或聯賽）下場比賽
+@tree.command(name="next", description="球隊下場比賽")
+@app_commands.choices(competition=COMPETITION_CHOICES)
+@app_commands.autocomplete(team=team_autocomplete)
+async def next_match(interaction: discord.Interaction, team: Optional[str] = None,
+                     competition: Optional[app_commands.Choice[str]] = None, limit: app_commands.Range[int, 1, 10] = 1):
+    await interaction.response.defer()
+    code = competition.value if competition else None
+    await send_query(interaction, lambda: query_engine.next_pages(code, query_engine.resolve_team(team), limit, guild_settings.locale_for(interaction.guild_id)), "比賽數據", "比賽")
 
 # 英超積分榜（全部隊伍）
 @tree.command(name="pl_standings", description="英超積分榜")
 async def pl_standings(interaction: discord.Interaction):
     await interaction.response.defer()
-    try:
-        url = "https://api.football-data.org/v4/competitions/PL/standings"
-        headers = {'X-Auth-Token': FOOTBALL_API_KEY}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        standings = data['standings'][0]['table']
-        message = "<:PL2:1406265845239255120>🏆 英超積分榜:\n"
-        stand = 1
-        for team in standings:            
-            team_name = team['team']['name']
-            emoji = TEAM_EMOJIS.get(team_name, '')
-            message += f"{stand}. {emoji} {team_name} - {team['points']} 分\n"
-            stand += 1
-        await interaction.followup.send(message)
-    except requests.HTTPError as e:
-        if e.response.status_code == 403:
-            await interaction.followup.send("⚠️ 英超數據訪問被拒，請檢查API金鑰或訂閱權限。")
-        else:
-            await interaction.followup.send(f"⚠️ 無法搵到英超數據，請稍後再試。錯誤: {str(e)}")
-    except requests.RequestException as e:
-        await interaction.followup.send(f"⚠️ 無法搵到英超數據，請稍後再試。錯誤: {str(e)}")
+    await send_query(interaction, lambda: query_engine.standings_pages('PL'), "英超數據", "英超數據")
 
 # 英超賽程（最近10場）
 @tree.command(name="pl_schedule", description="英超賽程（最近10場）")
 async def pl_schedule(interaction: discord.Interaction):
     await interaction.response.defer()
-    try:
-        url = "https://api.football-data.org/v4/competitions/PL/matches?status=SCHEDULED"
-        headers = {'X-Auth-Token': FOOTBALL_API_KEY}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        now = datetime.now(pytz.timezone('Asia/Hong_Kong'))
-        future_matches = [m for m in data['matches'] if datetime.fromisoformat(m['utcDate'].replace('Z', '+00:00')).astimezone(pytz.timezone('Asia/Hong_Kong')) > now]
-        matches = sorted(future_matches, key=lambda x: x['utcDate'])[:10]
-        remaining = len(future_matches)
-        message = "<:PL2:1406265845239255120> 英超賽程（最近10場）:\n"
-        if not matches:
-            message += "暫無未來賽程\n"
-        for match in matches:
-            home = match['homeTeam']['shortName']
-            away = match['awayTeam']['shortName']
-            home_emoji = TEAM_EMOJIS.get(home, '')
-            away_emoji = TEAM_EMOJIS.get(away, '')
-            date_hkt = to_hkt(match['utcDate'])
-            message += f"{date_hkt} \n{home_emoji}{home} vs {away_emoji}{away}\n\n"
-        message += f"📅 剩餘比賽數: {remaining} 場"
-        await interaction.followup.send(message)
-    except requests.HTTPError as e:
-        if e.response.status_code == 403:
-            await interaction.followup.send("⚠️ 英超賽程訪問被拒，請檢查API金鑰或訂閱權限。")
-        else:
-            await interaction.followup.send(f"⚠️ 無法搵到英超賽程，請稍後再試。錯誤: {str(e)}")
-    except requests.RequestException as e:
-        await interaction.followup.send(f"⚠️ 無法搵到英超賽程，請稍後再試。錯誤: {str(e)}")
+    await send_query(interaction, lambda: query_engine.schedule_pages('PL', None, 10, guild_settings.locale_for(interaction.guild_id)), "英超賽程", "英超賽程")
 
 # 英超下場比賽
 @tree.command(name="pl_next", description="英超下場比賽")
 async def pl_next(interaction: discord.Interaction):
     await interaction.response.defer()
-    try:
-        url = "https://api.football-data.org/v4/competitions/PL/matches?status=SCHEDULED"
-        headers = {'X-Auth-Token': FOOTBALL_API_KEY}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        now = datetime.now(pytz.timezone('Asia/Hong_Kong'))
-        next_match = next((m for m in sorted(data['matches'], key=lambda x: x['utcDate']) if datetime.fromisoformat(m['utcDate'].replace('Z', '+00:00')).astimezone(pytz.timezone('Asia/Hong_Kong')) > now), None)
-        if next_match:
-            home = next_match['homeTeam']['shortName']
-            away = next_match['awayTeam']['shortName']
-            home_emoji = TEAM_EMOJIS.get(home, '')
-            away_emoji = TEAM_EMOJIS.get(away, '')
-            date_hkt = to_hkt(next_match['utcDate'])
-            message = f"英超下場比賽: \n📅 {date_hkt} \n{home_emoji}{home} 🆚 {away_emoji}{away}"
-        else:
-            message = "英超下場比賽: 暫無未來比賽"
-        await interaction.followup.send(message)
-    except requests.HTTPError as e:
-        if e.response.status_code == 403:
-            await interaction.followup.send("⚠️ 英超賽程訪問被拒，請檢查API金鑰或訂閱權限。")
-        else:
-            await interaction.followup.send(f"⚠️ 無法搵到英超賽程，請稍後再試。錯誤: {str(e)}")
-    except requests.RequestException as e:
-        await interaction.followup.send(f"⚠️ 無法搵到英超賽程，請稍後再試。錯誤: {str(e)}")
+    await send_query(interaction, lambda: query_engine.next_pages('PL', None, 1, guild_settings.locale_for(interaction.guild_id)), "英超賽程", "英超賽程")
 
 # 下3場利物浦比賽
 @tree.command(name="next_liverpool", description="利物浦下3場比賽")
 async def next_liverpool(interaction: discord.Interaction):
     await interaction.response.defer()
-    try:
-        url = "https://api.football-data.org/v4/teams/64/matches?status=SCHEDULED"
-        headers = {'X-Auth-Token': FOOTBALL_API_KEY}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        now = datetime.now(pytz.timezone('Asia/Hong_Kong'))
-        future_matches = [m for m in data['matches'] if datetime.fromisoformat(m['utcDate'].replace('Z', '+00:00')).astimezone(pytz.timezone('Asia/Hong_Kong')) > now]
-        matches = sorted(future_matches, key=lambda x: x['utcDate'])[:3]
-        message = "利物浦下3場比賽:\n"
-        if not matches:
-            message += "暫無未來比賽\n"
-        for match in matches:
-            home = match['homeTeam']['shortName']
-            away = match['awayTeam']['shortName']
-            home_emoji = TEAM_EMOJIS.get(home, '')
-            away_emoji = TEAM_EMOJIS.get(away, '')
-            date_hkt = to_hkt(match['utcDate'])
-            message += f"📅 {date_hkt}\n{home_emoji}{home} 🆚 {away_emoji}{away}\n\n"
-        await interaction.followup.send(message)
-    except requests.HTTPError as e:
-        if e.response.status_code == 403:
-            await interaction.followup.send("⚠️ 利物浦比賽數據訪問被拒，請檢查API金鑰或訂閱權限。")
-        else:
-            await interaction.followup.send(f"⚠️ 無法搵到利物浦比賽，請稍後再試。錯誤: {str(e)}")
-    except requests.RequestException as e:
-        await interaction.followup.send(f"⚠️ 無法搵到利物浦比賽，請稍後再試。錯誤: {str(e)}")
+    await send_query(interaction, lambda: query_engine.next_pages(None, 64, 3, guild_settings.locale_for(interaction.guild_id)), "利物浦比賽數據", "利物浦比賽")
 
 # 今日比賽賽程
 @tree.command(name="today_matches", description="今日比賽賽程")
-async def today_matches(interaction: discord.Interaction):
+@app_commands.choices(competition=COMPETITION_CHOICES)
+async def today_matches(interaction: discord.Interaction, competition: Optional[app_commands.Choice[str]] = None):
     await interaction.response.defer()
-    try:
-        #today = (date.today()).strftime('%Y-%m-%d')
-        #tomorrow = (date.today() + timedelta(days=1)).strftime('%Y-%m-%d')
-        url = f"https://api.football-data.org/v4/matches"#?dateFrom={today}&dateTo={tomorrow}"
-        headers = {'X-Auth-Token': FOOTBALL_API_KEY}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        filtered_codes = ['DED', 'PPL', 'ELC', 'BSA', 'CLI', 'FL1']
-        filtered_matches = [m for m in data['matches'] if m['competition']['code'] not in filtered_codes]
-        matches = sorted(filtered_matches, key=lambda x: x['utcDate'])
-        message = "⚽ 今日比賽賽程:\n"
-        if not matches:
-            message += "暫無今日比賽\n"
-        for match in matches:
-            home = match['homeTeam']['shortName']
-            away = match['awayTeam']['shortName']
-            home_emoji = TEAM_EMOJIS.get(home, '')
-            away_emoji = TEAM_EMOJIS.get(away, '')
-            date_hkt = to_hkt(match['utcDate'])
-            comp_code = match['competition']['code']
-            league_name = "La Liga" if match['competition']['name'] == "Primera Division" else match['competition']['name']
-            league_emoji = LEAGUE_EMOJI.get(comp_code, '')
-            live_emoji = '<:LIVE3:1406332600900915232> ' if match['status'] == 'IN_PLAY' else '<:HT:1406255894643216435> ' if match['status'] == 'PAUSED' else '**Finished** ' if match['status'] == 'FINISHED' else ''
-            if match['status'] == 'IN_PLAY' or match['status'] == 'PAUSED' or match['status'] == 'FINISHED':
-                score = f"| {match['score']['fullTime']['home']} : {match['score']['fullTime']['away']}"
-            else:
-                score = ''
-            message += f"{date_hkt} | {league_emoji} {league_name}\n{live_emoji}{home_emoji}**{home}** vs {away_emoji}**{away}** {score}\n\n"
-            #print(url)
-        await interaction.followup.send(message)
-    except requests.HTTPError as e:
-        if e.response.status_code == 403:
-            await interaction.followup.send("⚠️ 今日比賽數據訪問被拒，請檢查API金鑰或訂閱權限。")
-        else:
-            await interaction.followup.send(f"⚠️ 無法搵到今日比賽，請稍後再試。錯誤: {str(e)}")
-    except requests.RequestException as e:
-        await interaction.followup.send(f"⚠️ 無法搵到今日比賽，請稍後再試。錯誤: {str(e)}")
+    code = competition.value if competition else None
+    await send_query(interaction, lambda: query_engine.today_pages(code, guild_settings.locale_for(interaction.guild_id)), "今日比賽數據", "今日比賽")
 
 # F1賽程（最近5場未來比賽）
 @tree.command(name="f1_schedule", description="F1賽程（最近5場未來比賽）")
 async def f1_schedule(interaction: discord.Interaction):
     await interaction.response.defer()
-    try:
-        url = "https://api.jolpi.ca/ergast/f1/current.json"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        now = datetime.now(pytz.timezone('Asia/Hong_Kong'))
-        future_races = [r for r in data['MRData']['RaceTable']['Races'] if datetime.fromisoformat(f"{r['date']}T{r['time']}".replace('Z', '+00:00')).astimezone(pytz.timezone('Asia/Hong_Kong')) > now]
-        races = sorted(future_races, key=lambda x: f"{x['date']}T{x['time']}")[:5]
-        remaining = len(future_races)
-        message = "🏎️ F1賽程（最近5場）:\n"
-        if not races:
-            message += "暫無未來賽程\n"
-        for race in races:
-            date_time = f"{race['date']}T{race['time']}"
-            date_hkt = to_hkt(date_time)
-            name = race['raceName']
-            country = race['Circuit']['Location']['country']
-            flag = COUNTRY_FLAGS.get(country, '🏳️')
-            message += f"{date_hkt} {flag} {name}\n"
-        message += f"📅 剩餘比賽數: {remaining} 場"
-        await interaction.followup.send(message)
-    except requests.RequestException as e:
-        await interaction.followup.send(f"⚠️ 無法搵到F1賽程，請稍後再試。錯誤: {str(e)}")
+    await send_query(interaction, lambda: query_engine.f1_schedule_pages(5, guild_settings.locale_for(interaction.guild_id)), "F1數據", "F1賽程")
 
 # F1下場比賽（含排位賽時間）
 @tree.command(name="f1_next", description="F1下場比賽")
 async def f1_next(interaction: discord.Interaction):
     await interaction.response.defer()
-    try:
-        url = "https://api.jolpi.ca/ergast/f1/current.json"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        now = datetime.now(pytz.timezone('Asia/Hong_Kong'))
-        next_race = next((r for r in sorted(data['MRData']['RaceTable']['Races'], key=lambda x: f"{x['date']}T{x['time']}") if datetime.fromisoformat(f"{r['date']}T{r['time']}".replace('Z', '+00:00')).astimezone(pytz.timezone('Asia/Hong_Kong')) > now), None)
-        if next_race:
-            date_time = f"{next_race['date']}T{next_race['time']}"
-            date_hkt = to_hkt(date_time)
-            name = next_race['raceName']
-            country = next_race['Circuit']['Location']['country']
-            flag = COUNTRY_FLAGS.get(country, '🏳️')
-            quali_date_time = f"{next_race['Qualifying']['date']}T{next_race['Qualifying']['time']}"
-            quali_hkt = to_hkt(quali_date_time)
-            message = f"F1下場比賽: \n{date_hkt} \n{flag} {name}\n排位賽: {quali_hkt}"
-        else:
-            message = "F1下場比賽: 暫無未來比賽"
-        await interaction.followup.send(message)
-    except requests.RequestException as e:
-        await interaction.followup.send(f"⚠️ 無法搵到F1賽程，請稍後再試。錯誤: {str(e)}")
+    await send_query(interaction, lambda: query_engine.f1_next_pages(guild_settings.locale_for(interaction.guild_id)), "F1數據", "F1賽程")
 
 # F1車手積分榜（頭10）
 @tree.command(name="f1_standings", description="F1車手榜")
 async def f1_standings(interaction: discord.Interaction):
     await interaction.response.defer()
+    await send_query(interaction, lambda: query_engine.f1_standings_pages(10), "F1數據", "F1積分")
+
+# 訂閱即時比賽推送（入波、半場、完場）
+@tree.command(name="live_subscribe", description="訂閱即時比賽推送（入波、半場、完場）")
+@app_commands.default_permissions(manage_channels=True)
+@app_commands.choices(competition=COMPETITION_CHOICES)
+@app_commands.autocomplete(team=team_autocomplete)
+async def live_subscribe(interaction: discord.Interaction, competition: Optional[app_commands.Choice[str]] = None, team: Optional[str] = None):
+    if competition is None and team is None:
+        await interaction.response.send_message("請揀聯賽或者球隊", ephemeral=True)
+        return
+    try:
+        team_id = query_engine.resolve_team(team)
+    except query_engine.QueryError as e:
+        await interaction.response.send_message(f"⚠️ {e}", ephemeral=True)
+        return
+    live_notifier.subscribe(interaction.channel_id, competition.value if competition else None, team_id)
+    await interaction.response.send_message("✅ 已訂閱即時比賽推送", ephemeral=True)
+
+# 取消訂閱（唔揀任何項目就全部取消）
+@tree.command(name="live_unsubscribe", description="取消即時比賽推送")
+@app_commands.default_permissions(manage_channels=True)
+@app_commands.choices(competition=COMPETITION_CHOICES)
+@app_commands.autocomplete(team=team_autocomplete)
+async def live_unsubscribe(interaction: discord.Interaction, competition: Optional[app_commands.Choice[str]] = None, team: Optional[str] = None):
     try:
-        url = "https://api.jolpi.ca/ergast/f1/current/driverStandings.json"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        standings = data['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings'][:10]
-        message = "🏆 F1車手積分榜（頭10）:\n"
-        for driver in standings:
-            name = driver['Driver']['givenName'] + " " + driver['Driver']['familyName']
-            points = driver['points']
-            nationality = driver['Driver']['nationality']
-            flag = COUNTRY_FLAGS.get(nationality, '🏳️')
-            message += f"{flag} {name} - {points} 分\n"
-        await interaction.followup.send(message)
-    except requests.RequestException as e:
-        await interaction.followup.send(f"⚠️ 無法搵到F1積分，請稍後再試。錯誤: {str(e)}")
+        team_id = query_engine.resolve_team(team)
+    except query_engine.QueryError as e:
+        await interaction.response.send_message(f"⚠️ {e}", ephemeral=True)
+        return
+    live_notifier.unsubscribe(interaction.channel_id, competition.value if competition else None, team_id)
+    await interaction.response.send_message("✅ 已取消訂閱", ephemeral=True)
+
+# 查看本頻道訂閱
+@tree.command(name="live_subscriptions", description="查看本頻道嘅即時比賽推送")
+async def live_subscriptions(interaction: discord.Interaction):
+    subs = live_notifier.subscriptions_for(interaction.channel_id)
+    competitions = [query_engine.competition_label(code) for code in sorted(subs['competitions'])]
+    team_names = [query_engine.team_label(team_id) for team_id in sorted(subs['teams'])]
+    if not competitions and not team_names:
+        await interaction.response.send_message("本頻道未有訂閱", ephemeral=True)
+        return
+    message = "📡 本頻道訂閱:\n"
+    if competitions:
+        message += f"聯賽: {', '.join(competitions)}\n"
+    if team_names:
+        message += f"球隊: {', '.join(team_names)}\n"
+    await interaction.response.send_message(message, ephemeral=True)
+
+# 即時比分板：發一次今日賽程，之後只編輯有變嘅頁面
+@tree.command(name="live_board", description="喺本頻道開啟即時比分板")
+@app_commands.default_permissions(manage_channels=True)
+async def live_board_start(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
+    try:
+        index = await sports_api.get_match_index("matches")
+        await live_board.start(interaction.channel, interaction.channel_id, index, guild_settings.locale_for(interaction.guild_id))
+        await interaction.followup.send("✅ 已開啟即時比分板", ephemeral=True)
+    except aiohttp.ClientResponseError as e:
+        if e.status == 403:
+            await interaction.followup.send("⚠️ 今日比賽數據訪問被拒，請檢查API金鑰或訂閱權限。", ephemeral=True)
+        else:
+            await interaction.followup.send(f"⚠️ 無法搵到今日比賽，請稍後再試。錯誤: {str(e)}", ephemeral=True)
+    except (aiohttp.ClientError, asyncio.TimeoutError, RateLimited) as e:
+        await interaction.followup.send(f"⚠️ 無法搵到今日比賽，請稍後再試。錯誤: {str(e)}", ephemeral=True)
+
+@tree.command(name="live_board_stop", description="關閉本頻道嘅即時比分板")
+@app_commands.default_permissions(manage_channels=True)
+async def live_board_stop(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
+    if await live_board.stop(interaction.channel_id, interaction.channel):
+        await interaction.followup.send("✅ 已關閉即時比分板", ephemeral=True)
+    else:
+        await interaction.followup.send("本頻道未有即時比分板", ephemeral=True)
+
+# 伺服器時區自動完成
+async def timezone_autocomplete(interaction: discord.Interaction, current: str):
+    return [app_commands.Choice(name=name, value=name) for name in guild_settings.timezone_choices(current)]
+
+TIME_FORMAT_CHOICES = [app_commands.Choice(name=label, value=key) for key, (label, _) in TIME_FORMATS.items()]
+
+# 設定本伺服器顯示時間用嘅時區同格式（預設香港時間）
+@tree.command(name="set_timezone", description="設定本伺服器嘅時區同時間格式")
+@app_commands.default_permissions(manage_guild=True)
+@app_commands.guild_only()
+@app_commands.choices(time_format=TIME_FORMAT_CHOICES)
+@app_commands.autocomplete(timezone=timezone_autocomplete)
+async def set_timezone(interaction: discord.Interaction, timezone: Optional[str] = None,
+                       time_format: Optional[app_commands.Choice[str]] = None):
+    if timezone is None and time_format is None:
+        guild_settings.reset(interaction.guild_id)
+        zone, fmt = guild_settings.locale_for(interaction.guild_id)
+        await interaction.response.send_message(f"✅ 已還原預設: {zone}（{TIME_FORMATS[fmt][0]}）", ephemeral=True)
+        return
+    try:
+        zone, fmt = guild_settings.update(interaction.guild_id, timezone, time_format.value if time_format else None)
+    except ValueError as e:
+        await interaction.response.send_message(f"⚠️ {e}", ephemeral=True)
+        return
+    await interaction.response.send_message(f"✅ 本伺服器時間: {zone}（{TIME_FORMATS[fmt][0]}）", ephemeral=True)
+
+# 管理員：延遲、錯誤、快取命中率
+@tree.command(name="bot_stats", description="Bot 效能統計（管理員）")
+@app_commands.default_permissions(administrator=True)
+async def bot_stats(interaction: discord.Interaction):
+    pages = render.paginate([line + "\n" for line in metrics.render_text().split("\n")])
+    await interaction.response.send_message(pages[0], ephemeral=True)
+    for page in pages[1:]:
+        await interaction.followup.send(page, ephemeral=True)
 
 @tree.command(name="fix_x_link", description="將 x.com 連結轉為 fixupx.com")
 async def fix_x_link(interaction: discord.Interaction, url: str):
@@ -370,7 +359,10 @@ async def fix_x_link(interaction: discord.Interaction, url: str):
         await interaction.response.send_message("無效嘅 x.com 連結", ephemeral=True)
         return
     fixupx_url = twitter_handler.replace_to_fixupx(links[0])
-    view = await twitter_handler.create_tweet_view(links[0])
+    view = twitter_handler.build_tweet_view(links[:1])
     await interaction.response.send_message(content=fixupx_url, view=view)        
 
-bot.run(TOKEN)
\ No newline at end of file
+# 日誌已經由 log_setup 處理，唔使 discord.py 再加 handler
+# （只喺直接執行時連線，等 bench 可以 import 指令處理函數）
+if __name__ == '__main__':
+    bot.run(TOKEN, log_handler=None)
\ No newline at end of file
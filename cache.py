@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger('cache')
+
+# 單個快取項目
+class CacheEntry:
+    __slots__ = ('value', 'fetched_at', 'expires_at')
+
+    def __init__(self, value: Any, ttl: float, age: float = 0.0):
+        self.value = value
+        self.fetched_at = time.monotonic() - age
+        self.expires_at = self.fetched_at + ttl
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+# TTL + LRU 快取：同一個 key 嘅並發請求共用一次上游請求，過期資料喺背景更新期間照樣返回
+class TTLCache:
+    def __init__(self, maxsize: int = 128, max_stale: float = 86400.0):
+        self.maxsize = maxsize
+        self.max_stale = max_stale
+        self._entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    async def get(self, key: Hashable, fetcher: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if entry.is_fresh():
+                self.hits += 1
+                return entry.value
+            if time.monotonic() - entry.expires_at < self.max_stale:
+                # 過期：即刻返回舊資料，背景更新
+                self.stale_hits += 1
+                self._refresh(key, fetcher, ttl)
+                return entry.value
+
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        task = self._refresh(key, fetcher, ttl)
+        # shield 防止單一互動被取消時連帶取消共用請求
+        return await asyncio.shield(task)
+
+    # 強制重新請求（背景預取用），唔理現有項目有冇過期
+    async def refresh(self, key: Hashable, fetcher: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        return await asyncio.shield(self._refresh(key, fetcher, ttl))
+
+    def _refresh(self, key: Hashable, fetcher: Callable[[], Awaitable[Any]], ttl: float) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        async def run():
+            try:
+                value = await fetcher()
+                self.set(key, value, ttl)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(self._log_failure)
+        self._inflight[key] = task
+        return task
+
+    def _log_failure(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"快取更新失敗: {task.exception()}")
+
+    # age：資料已經有幾舊（例如由磁碟載入嘅快照）
+    def set(self, key: Hashable, value: Any, ttl: float, age: float = 0.0):
+        self._entries[key] = CacheEntry(value, ttl, age)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # 同步查詢：未過期先返回，否則返回 None
+    def get_fresh(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry.is_fresh():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+        self.misses += 1
+        return None
+
+    # 唔理過期與否，直接睇快取內容
+    def peek(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    # 資料幾耐之前攞（秒），冇就返回 None
+    def age(self, key: Hashable):
+        entry = self._entries.get(key)
+        return time.monotonic() - entry.fetched_at if entry is not None else None
+
+    def keys(self) -> list:
+        return list(self._entries)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'hit_rate': (lookups - self.misses) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,175 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional, Tuple
+
+logger = logging.getLogger('cache_store')
+
+CACHE_DB = os.getenv('CACHE_DB', 'cache.sqlite3')
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(CACHE_DB, check_same_thread=False)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL, '
+            'etag TEXT, last_modified TEXT)'
+        )
+        # 多進程模式用：上游請求租約同共用配額
+        _conn.execute('CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)')
+        _conn.execute(
+            'CREATE TABLE IF NOT EXISTS quota ('
+            'bucket TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, blocked_until REAL NOT NULL DEFAULT 0)'
+        )
+        _conn.commit()
+    return _conn
+
+# 逐行讀出快照：(key, data, 已過秒數, etag, last_modified)；舊到新排列，LRU 快取先會保留最新嗰批
+# 超過 max_age 秒嘅快照已經冇用，順手刪除
+def load(max_age: Optional[float] = None) -> Iterator[Tuple[str, dict, float, Optional[str], Optional[str]]]:
+    now = time.time()
+    try:
+        with _lock:
+            conn = _connect()
+            if max_age is not None:
+                conn.execute('DELETE FROM responses WHERE fetched_at < ?', (now - max_age,))
+                conn.commit()
+            rows = conn.execute('SELECT key, data, fetched_at, etag, last_modified FROM responses ORDER BY fetched_at').fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"無法讀取快取快照: {e}")
+        return
+    for key, data, fetched_at, etag, last_modified in rows:
+        try:
+            yield key, json.loads(data), max(0.0, now - fetched_at), etag, last_modified
+        except ValueError:
+            continue
+
+# 寫入一個回應（喺 thread 入面跑，唔阻塞 event loop）
+def save(key: str, data: dict, etag: Optional[str] = None, last_modified: Optional[str] = None,
+         fetched_at: Optional[float] = None):
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (key, data, fetched_at, etag, last_modified) VALUES (?, ?, ?, ?, ?)',
+                (key, payload, fetched_at or time.time(), etag, last_modified),
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"無法寫入快取快照: {e}")
+
+# 304 時只更新時間
+def touch(key: str, fetched_at: Optional[float] = None):
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute('UPDATE responses SET fetched_at = ? WHERE key = ?', (fetched_at or time.time(), key))
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"無法更新快取快照: {e}")
+
+# 其他進程 max_age 秒內寫入嘅回應：(data, 已過秒數, etag, last_modified)，冇就返回 None
+def fresh(key: str, max_age: float) -> Optional[Tuple[dict, float, Optional[str], Optional[str]]]:
+    now = time.time()
+    try:
+        with _lock:
+            row = _connect().execute(
+                'SELECT data, fetched_at, etag, last_modified FROM responses WHERE key = ? AND fetched_at >= ?',
+                (key, now - max_age),
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.error(f"無法讀取共用快取: {e}")
+        return None
+    if row is None:
+        return None
+    data, fetched_at, etag, last_modified = row
+    try:
+        return json.loads(data), max(0.0, now - fetched_at), etag, last_modified
+    except ValueError:
+        return None
+
+# 搶租約：冇人持有、已過期或者本身係 owner 就成功
+def claim(name: str, owner: str, lease: float) -> bool:
+    now = time.time()
+    try:
+        with _lock:
+            conn = _connect()
+            cursor = conn.execute(
+                'INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at '
+                'WHERE leases.expires_at < ? OR leases.owner = excluded.owner',
+                (name, owner, now + lease, now),
+            )
+            conn.commit()
+            return cursor.rowcount == 1
+    except sqlite3.Error as e:
+        logger.error(f"無法取得租約 {name}: {e}")
+        # 資料庫有問題就當自己攞到，最多退化成各進程各自請求
+        return True
+
+def release(name: str, owner: str):
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute('DELETE FROM leases WHERE name = ? AND owner = ?', (name, owner))
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"無法釋放租約 {name}: {e}")
+
+# 所有進程共用嘅 token bucket：攞到配額返回 0，否則返回要等幾多秒
+def take_token(bucket: str, capacity: float, refill_rate: float) -> float:
+    now = time.time()
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT tokens, updated_at, blocked_until FROM quota WHERE bucket = ?', (bucket,)).fetchone()
+                tokens, updated_at, blocked_until = row if row is not None else (capacity, now, 0.0)
+                tokens = min(capacity, tokens + max(0.0, now - updated_at) * refill_rate)
+                if now < blocked_until:
+                    wait = blocked_until - now
+                elif tokens >= 1:
+                    tokens -= 1
+                    wait = 0.0
+                else:
+                    wait = (1 - tokens) / refill_rate
+                conn.execute(
+                    'INSERT OR REPLACE INTO quota (bucket, tokens, updated_at, blocked_until) VALUES (?, ?, ?, ?)',
+                    (bucket, tokens, now, blocked_until),
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            return wait
+    except sqlite3.Error as e:
+        logger.error(f"無法讀取共用配額: {e}")
+        return 0.0
+
+# 上游話配額用盡：所有進程等到 until（epoch 秒）
+def block(bucket: str, until: float):
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute('UPDATE quota SET tokens = 0, updated_at = ?, blocked_until = MAX(blocked_until, ?) WHERE bucket = ?',
+                         (time.time(), until, bucket))
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"無法更新共用配額: {e}")
+
+def close():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
@@ -0,0 +1,65 @@
+# 國家旗幟映射
+COUNTRY_FLAGS = {
+    'England': '🇬🇧', 'Spain': '🇪🇸', 'Germany': '🇩🇪', 'Italy': '🇮🇹', 'France': '🇫🇷',
+    'Netherlands': '🇳🇱', 'Portugal': '🇵🇹', 'Belgium': '🇧🇪', 'Brazil': '🇧🇷', 'Argentina': '🇦🇷',
+    'Bahrain': '🇧🇭', 'Australia': '🇦🇺', 'China': '🇨🇳', 'Monaco': '🇲🇨', 'Canada': '🇨🇦',
+    'Austria': '🇦🇹', 'Hungary': '🇭🇺', 'Singapore': '🇸🇬', 'Japan': '🇯🇵', 'United States': '🇺🇸',
+    'Mexico': '🇲🇽', 'Qatar': '🇶🇦', 'United Arab Emirates': '🇦🇪', 'Saudi Arabia': '🇸🇦',
+    'British': '🇬🇧', 'Dutch': '🇳🇱', 'Spanish': '🇪🇸', 'Finnish': '🇫🇮', 'Mexican': '🇲🇽',
+    'Monegasque': '🇲🇨', 'Australian': '🇦🇺', 'Canadian': '🇨🇦', 'French': '🇫🇷', 'German': '🇩🇪',
+    'Italian': '🇮🇹', 'Thai': '🇹🇭', 'Azerbaijan': '🇦🇿' , 'USA': '🇺🇸'
+}
+
+# 英超球隊emoji（保留shortname and short name）
+TEAM_EMOJIS = {
+    'AFC Bournemouth': '<:bou:1404703461211115611> ',
+    'West Ham United FC': '<:wes:1404703431414780025> ',
+    'Brentford FC': '<:bre:1404703388310048799> ',
+    'Brighton & Hove Albion FC': '<:bri:1404703345079353395> ',
+    'Crystal Palace FC': '<:cry:1404703320974688318> ',
+    'Nottingham Forest FC': '<:not:1404703264510836807> ',
+    'Leeds United FC': '<:lee:1404703235821928499> ',
+    'Burnley FC': '<:bur:1404703096617304186> ',
+    'Wolverhampton Wanderers FC': '<:wol:1404703054913081487> ',
+    'Tottenham Hotspur FC': '<:tot:1404703032385474611> ',
+    'Sunderland AFC': '<:sun:1404702964354121824> ',
+    'Newcastle United FC': '<:new:1404702938030669834> ',
+    'Manchester United FC': '<:mu:1404702913787465739> ',
+    'Manchester City FC': '<:mc:1404702893444960286> ',
+    'Liverpool FC': '<:liv:1404702872259526707> ',
+    'Fulham FC': '<:ful:1404702776348377160> ',
+    'Everton FC': '<:eve:1404702731654008903> ',
+    'Chelsea FC': '<:che:1404702690570670104> ',
+    'Aston Villa FC': '<:ast:1404702655812735008> ',
+    'Arsenal FC': '<:ars:1404702558374858822> ',
+
+    'Bournemouth': '<:bou:1404703461211115611> ',
+    'West Ham': '<:wes:1404703431414780025> ',
+    'Brentford': '<:bre:1404703388310048799> ',
+    'Brighton Hove': '<:bri:1404703345079353395> ',
+    'Crystal Palace': '<:cry:1404703320974688318> ',
+    'Nottingham': '<:not:1404703264510836807> ',
+    'Leeds United': '<:lee:1404703235821928499> ',
+    'Burnley': '<:bur:1404703096617304186> ',
+    'Wolverhampton': '<:wol:1404703054913081487> ',
+    'Tottenham': '<:tot:1404703032385474611> ',
+    'Sunderland': '<:sun:1404702964354121824> ',
+    'Newcastle': '<:new:1404702938030669834> ',
+    'Man United': '<:mu:1404702913787465739> ',
+    'Man City': '<:mc:1404702893444960286> ',
+    'Liverpool': '<:liv:1404702872259526707> ',
+    'Fulham': '<:ful:1404702776348377160> ',
+    'Everton': '<:eve:1404702731654008903> ',
+    'Chelsea': '<:che:1404702690570670104> ',
+    'Aston Villa': '<:ast:1404702655812735008> ',
+    'Arsenal': '<:ars:1404702558374858822> '
+}
+
+# 聯賽國家emoji映射
+LEAGUE_EMOJI = {
+    'PL': '<:PL2:1406265845239255120>',  # Premier League
+    'PD': '<:laliga:1406264996429828136>',   # La Liga
+    'BL1': '<:BL1:1406264975172833341>',
+    'SA': '<:SA:1406265008265891930>'
+    # 若有其他聯賽，可加
+}
@@ -0,0 +1,70 @@
+import functools
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import available_timezones
+
+from models import DEFAULT_LOCALE, DEFAULT_TIME_FORMAT, DEFAULT_TIMEZONE, TIME_FORMATS
+
+logger = logging.getLogger('guild_settings')
+
+GUILD_SETTINGS_FILE = os.getenv('GUILD_SETTINGS_FILE', 'guild_settings.json')
+
+# guild_id -> (時區, 時間格式 key)；冇設定嘅伺服器用 DEFAULT_LOCALE
+_locales: Dict[int, Tuple[str, str]] = {}
+
+def load():
+    _locales.clear()
+    try:
+        with open(GUILD_SETTINGS_FILE, encoding='utf-8') as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        logger.error(f"無法讀取伺服器設定: {e}")
+        return
+    for guild_id, settings in raw.items():
+        timezone = settings.get('timezone', DEFAULT_TIMEZONE)
+        time_format = settings.get('time_format', DEFAULT_TIME_FORMAT)
+        if timezone not in _timezones() or time_format not in TIME_FORMATS:
+            logger.warning(f"伺服器 {guild_id} 設定無效，改用預設: {settings}")
+            continue
+        _locales[int(guild_id)] = (timezone, time_format)
+
+def _save():
+    raw = {str(guild_id): {'timezone': timezone, 'time_format': time_format}
+           for guild_id, (timezone, time_format) in _locales.items()}
+    with open(GUILD_SETTINGS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(raw, f, ensure_ascii=False)
+
+@functools.lru_cache(maxsize=1)
+def _timezones() -> List[str]:
+    return sorted(available_timezones())
+
+def locale_for(guild_id: Optional[int]) -> Tuple[str, str]:
+    return _locales.get(guild_id, DEFAULT_LOCALE)
+
+# 更新伺服器時區及／或時間格式；時區名無效就拋出 ValueError
+def update(guild_id: int, timezone: Optional[str] = None, time_format: Optional[str] = None) -> Tuple[str, str]:
+    current_timezone, current_format = locale_for(guild_id)
+    if timezone is not None and timezone not in _timezones():
+        raise ValueError(f"未知時區「{timezone}」，請喺自動完成清單揀選")
+    if time_format is not None and time_format not in TIME_FORMATS:
+        raise ValueError(f"未知時間格式「{time_format}」")
+    locale = (timezone or current_timezone, time_format or current_format)
+    if locale == DEFAULT_LOCALE:
+        _locales.pop(guild_id, None)
+    else:
+        _locales[guild_id] = locale
+    _save()
+    return locale
+
+def reset(guild_id: int):
+    if _locales.pop(guild_id, None) is not None:
+        _save()
+
+# 時區自動完成（最多25個）
+def timezone_choices(current: str) -> List[str]:
+    current = current.lower().replace(' ', '_')
+    return [name for name in _timezones() if current in name.lower()][:25]
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+import metrics
+
+logger = logging.getLogger('http_client')
+
+# 每個上游主機嘅同時請求上限
+HOST_LIMITS = {
+    'api.football-data.org': 4,
+    'api.jolpi.ca': 4,
+}
+DEFAULT_HOST_LIMIT = 2
+
+# 連接池設定
+POOL_SIZE = 20
+KEEPALIVE_TIMEOUT = 30
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5)
+
+_session: Optional[aiohttp.ClientSession] = None
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+# 取得共用嘅 ClientSession（第一次用時先建立，確保喺 event loop 入面）
+def get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=POOL_SIZE,
+            limit_per_host=max(HOST_LIMITS.values()),
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300,
+        )
+        _session = aiohttp.ClientSession(connector=connector, timeout=REQUEST_TIMEOUT)
+    return _session
+
+def _host_semaphore(host: str) -> asyncio.Semaphore:
+    semaphore = _semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+        _semaphores[host] = semaphore
+    return semaphore
+
+# 非阻塞 GET 請求，返回 (JSON, 回應標頭)；HTTP 錯誤會拋出 aiohttp.ClientResponseError
+# 條件請求收到 304 Not Modified 時 JSON 為 None
+async def fetch(url: str, headers: Optional[dict] = None) -> Tuple[Optional[dict], Mapping[str, str]]:
+    host = urlsplit(url).hostname or ''
+    endpoint = metrics.endpoint_name(url)
+    async with _host_semaphore(host):
+        started = time.perf_counter()
+        try:
+            async with get_session().get(url, headers=headers) as response:
+                if response.status == 429:
+                    metrics.increment('upstream_429')
+                response.raise_for_status()
+                if response.status == 304:
+                    metrics.increment('upstream_304')
+                    return None, response.headers
+                return await response.json(content_type=None), response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            metrics.increment('upstream_errors')
+            raise
+        finally:
+            metrics.observe(f"upstream {endpoint}", time.perf_counter() - started)
+
+async def fetch_json(url: str, headers: Optional[dict] = None) -> dict:
+    data, _ = await fetch(url, headers=headers)
+    return data
+
+# 關閉連接池
+async def close():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+import guild_settings
+import render
+import sports_api
+from models import DEFAULT_LOCALE, MatchIndex, format_times
+from render import paginate
+
+logger = logging.getLogger('live_board')
+
+BOARDS_FILE = os.getenv('LIVE_BOARDS_FILE', 'live_boards.json')
+# 同一頻道兩次編輯之間最少相隔（Discord 每頻道約5秒5次）
+EDIT_INTERVAL = 1.2
+# 今日賽程唔顯示嘅聯賽
+TODAY_FILTERED_CODES = ['DED', 'PPL', 'ELC', 'BSA', 'CLI', 'FL1']
+
+# channel_id -> [{'id': message_id, 'hash': 頁面hash}]
+_boards: Dict[int, List[dict]] = {}
+_locks: Dict[int, asyncio.Lock] = {}
+_last_edit: Dict[int, float] = {}
+_client: Optional[discord.Client] = None
+
+def setup(client: discord.Client):
+    global _client
+    _client = client
+    load()
+
+def load():
+    _boards.clear()
+    try:
+        with open(BOARDS_FILE, encoding='utf-8') as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        logger.error(f"無法讀取即時比分板設定: {e}")
+        return
+    for channel_id, pages in raw.items():
+        _boards[int(channel_id)] = pages
+
+def _save():
+    with open(BOARDS_FILE, 'w', encoding='utf-8') as f:
+        json.dump({str(channel_id): pages for channel_id, pages in _boards.items()}, f)
+
+def _format_today_match(match, date_hkt: str) -> str:
+    league_name = "La Liga" if match.competition_name == "Primera Division" else match.competition_name
+    live_emoji = '<:LIVE3:1406332600900915232> ' if match.status == 'IN_PLAY' else '<:HT:1406255894643216435> ' if match.status == 'PAUSED' else '**Finished** ' if match.status == 'FINISHED' else ''
+    if match.status == 'IN_PLAY' or match.status == 'PAUSED' or match.status == 'FINISHED':
+        score = f"| {match.score_home} : {match.score_away}"
+    else:
+        score = ''
+    return f"{date_hkt} | {match.league_emoji} {league_name}\n{live_emoji}{match.home_emoji}**{match.home}** vs {match.away_emoji}**{match.away}** {score}\n\n"
+
+# 今日賽程，按2000字上限分頁；指定聯賽就直接用聯賽索引
+def render_today(index: MatchIndex, competition: Optional[str] = None, locale: Tuple[str, str] = DEFAULT_LOCALE) -> List[str]:
+    if competition:
+        timeline = index.by_competition.get(competition)
+        matches = timeline.items if timeline else []
+    else:
+        matches = [m for m in index.all.items if m.competition_code not in TODAY_FILTERED_CODES]
+    if not matches:
+        return ["⚽ 今日比賽賽程:\n暫無今日比賽\n"]
+    times = format_times((match.kickoff for match in matches), locale)
+    return paginate([_format_today_match(match, kickoff) for match, kickoff in zip(matches, times)], header="⚽ 今日比賽賽程:\n")
+
+# 命令同比分板共用同一份渲染結果，資料版本冇變就唔使重新格式化；同時區嘅伺服器共用
+def today_pages(index: MatchIndex, competition: Optional[str] = None, locale: Tuple[str, str] = DEFAULT_LOCALE) -> List[str]:
+    version = sports_api.data_version('football', 'matches', index)
+    return render.cached_pages(('today', competition), version, lambda: (render_today(index, competition, locale), None), locale)
+
+def _page_hash(page: str) -> str:
+    return hashlib.sha1(page.encode('utf-8')).hexdigest()
+
+# 開始喺頻道顯示即時比分板
+async def start(channel: discord.abc.Messageable, channel_id: int, index: MatchIndex,
+                locale: Tuple[str, str] = DEFAULT_LOCALE):
+    await stop(channel_id, channel)
+    pages = today_pages(index, locale=locale)
+    board = []
+    for page in pages:
+        message = await channel.send(page)
+        board.append({'id': message.id, 'hash': _page_hash(page)})
+    _boards[channel_id] = board
+    _last_edit[channel_id] = time.monotonic()
+    _save()
+
+# 停止比分板（可選擇刪除舊訊息）
+async def stop(channel_id: int, channel: Optional[discord.abc.Messageable] = None):
+    board = _boards.pop(channel_id, None)
+    if board is None:
+        return False
+    _save()
+    if channel is not None:
+        for page in board:
+            try:
+                await channel.get_partial_message(page['id']).delete()
+            except discord.HTTPException:
+                pass
+    return True
+
+async def _throttle(channel_id: int):
+    wait = _last_edit.get(channel_id, 0) + EDIT_INTERVAL - time.monotonic()
+    if wait > 0:
+        await asyncio.sleep(wait)
+    _last_edit[channel_id] = time.monotonic()
+
+# 只編輯內容有變嘅頁面
+async def _update_channel(channel_id: int, pages: List[str], hashes: List[str]):
+    channel = _client.get_channel(channel_id)
+    if channel is None:
+        return
+    lock = _locks.setdefault(channel_id, asyncio.Lock())
+    async with lock:
+        board = _boards.get(channel_id)
+        if board is None:
+            return
+        changed = False
+        for i, (page, page_hash) in enumerate(zip(pages, hashes)):
+            if i < len(board) and board[i]['hash'] == page_hash:
+                continue
+            await _throttle(channel_id)
+            try:
+                if i < len(board):
+                    await channel.get_partial_message(board[i]['id']).edit(content=page)
+                    board[i]['hash'] = page_hash
+                else:
+                    message = await channel.send(page)
+                    board.append({'id': message.id, 'hash': page_hash})
+            except discord.NotFound:
+                # 訊息俾人刪咗，停止呢個比分板
+                _boards.pop(channel_id, None)
+                _save()
+                return
+            except discord.HTTPException as e:
+                logger.error(f"無法更新即時比分板 {channel_id}: {e}")
+                return
+            changed = True
+        # 頁數減少：刪走多出嚟嘅訊息
+        while len(board) > len(pages):
+            extra = board.pop()
+            await _throttle(channel_id)
+            try:
+                await channel.get_partial_message(extra['id']).delete()
+            except discord.HTTPException:
+                pass
+            changed = True
+        if changed:
+            _save()
+
+# 由背景預取喺即時 feed 更新後呼叫；同時區嘅頻道共用同一份渲染結果
+async def on_live_update(index: MatchIndex):
+    if not _boards or _client is None:
+        return
+    # 按伺服器時區分組，每個時區只渲染一次
+    by_locale: Dict[Tuple[str, str], List[int]] = {}
+    for channel_id in list(_boards):
+        channel = _client.get_channel(channel_id)
+        guild = getattr(channel, 'guild', None)
+        by_locale.setdefault(guild_settings.locale_for(guild.id if guild else None), []).append(channel_id)
+    updates = []
+    for locale, channel_ids in by_locale.items():
+        pages = today_pages(index, locale=locale)
+        hashes = [_page_hash(page) for page in pages]
+        updates.extend(_update_channel(channel_id, pages, hashes) for channel_id in channel_ids)
+    await asyncio.gather(*updates)
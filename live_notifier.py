@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+from models import Match, MatchIndex
+
+logger = logging.getLogger('live_notifier')
+
+SUBSCRIPTIONS_FILE = os.getenv('SUBSCRIPTIONS_FILE', 'subscriptions.json')
+
+# channel_id -> {'competitions': set(code), 'teams': set(team_id)}
+_subscriptions: Dict[int, Dict[str, set]] = {}
+# match_id -> (status, 主隊入球, 客隊入球)
+_snapshot: Dict[int, Tuple[Optional[str], Optional[int], Optional[int]]] = {}
+_client: Optional[discord.Client] = None
+
+def setup(client: discord.Client):
+    global _client
+    _client = client
+    load()
+
+def load():
+    _subscriptions.clear()
+    try:
+        with open(SUBSCRIPTIONS_FILE, encoding='utf-8') as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        logger.error(f"無法讀取訂閱設定: {e}")
+        return
+    for channel_id, subs in raw.items():
+        _subscriptions[int(channel_id)] = {
+            'competitions': set(subs.get('competitions', [])),
+            'teams': set(subs.get('teams', [])),
+        }
+
+def _save():
+    raw = {
+        str(channel_id): {'competitions': sorted(subs['competitions']), 'teams': sorted(subs['teams'])}
+        for channel_id, subs in _subscriptions.items()
+    }
+    with open(SUBSCRIPTIONS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(raw, f, ensure_ascii=False)
+
+def subscribe(channel_id: int, competition: Optional[str] = None, team: Optional[int] = None):
+    subs = _subscriptions.setdefault(channel_id, {'competitions': set(), 'teams': set()})
+    if competition:
+        subs['competitions'].add(competition)
+    if team is not None:
+        subs['teams'].add(team)
+    _save()
+
+def unsubscribe(channel_id: int, competition: Optional[str] = None, team: Optional[int] = None):
+    subs = _subscriptions.get(channel_id)
+    if subs is None:
+        return
+    if competition is None and team is None:
+        del _subscriptions[channel_id]
+    else:
+        subs['competitions'].discard(competition)
+        subs['teams'].discard(team)
+        if not subs['competitions'] and not subs['teams']:
+            del _subscriptions[channel_id]
+    _save()
+
+def subscriptions_for(channel_id: int) -> Dict[str, set]:
+    return _subscriptions.get(channel_id, {'competitions': set(), 'teams': set()})
+
+def _scoreline(match: Match) -> str:
+    return (f"{match.league_emoji} {match.home_emoji}**{match.home}** "
+            f"{match.score_home} : {match.score_away} {match.away_emoji}**{match.away}**")
+
+# 比較前後兩次快照，只返回入波、半場、完場事件
+def diff(index: MatchIndex) -> List[Tuple[Match, str]]:
+    global _snapshot
+    events = []
+    first_run = not _snapshot
+    snapshot = {}
+    for match in index.all.items:
+        current = (match.status, match.score_home, match.score_away)
+        previous = _snapshot.get(match.id)
+        snapshot[match.id] = current
+        if first_run or previous is None or previous == current:
+            continue
+        old_status, old_home, old_away = previous
+        if (match.score_home or 0) > (old_home or 0) or (match.score_away or 0) > (old_away or 0):
+            events.append((match, f"⚽ 入波！ {_scoreline(match)}"))
+        if match.status == 'PAUSED' and old_status != 'PAUSED':
+            events.append((match, f"<:HT:1406255894643216435> 半場 {_scoreline(match)}"))
+        elif match.status == 'FINISHED' and old_status != 'FINISHED':
+            events.append((match, f"🏁 完場 {_scoreline(match)}"))
+    # 用今次快照取代舊嘅，唔再出現喺 feed 嘅比賽自然清走
+    _snapshot = snapshot
+    return events
+
+def _wants(subs: Dict[str, set], match: Match) -> bool:
+    return (match.competition_code in subs['competitions']
+            or match.home_id in subs['teams'] or match.away_id in subs['teams'])
+
+# 由背景預取喺每次即時 feed 更新後呼叫；一次上游請求服務所有訂閱頻道
+async def on_live_update(index: MatchIndex):
+    events = diff(index)
+    if not events or not _subscriptions or _client is None:
+        return
+    for channel_id, subs in list(_subscriptions.items()):
+        lines = [text for match, text in events if _wants(subs, match)]
+        if not lines:
+            continue
+        channel = _client.get_channel(channel_id)
+        if channel is None:
+            continue
+        try:
+            # 同一頻道嘅事件合併成一個訊息
+            await channel.send("\n".join(lines)[:2000])
+        except discord.HTTPException as e:
+            logger.error(f"無法推送比賽事件到 {channel_id}: {e}")
@@ -0,0 +1,61 @@
+import atexit
+import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+LOG_FILE = os.getenv('LOG_FILE', 'bot.log')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '7'))
+LOG_FORMAT = '%(asctime)s: %(levelname)s: %(name)s: %(message)s'
+
+# 結構化欄位：用 logger.info(..., extra={'command': ...}) 傳入
+STRUCTURED_FIELDS = ('command', 'guild', 'upstream', 'latency_ms', 'cache')
+
+_listener: Optional[QueueListener] = None
+
+# 喺訊息後面加上 key=value 欄位
+class StructuredFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = [f"{name}={getattr(record, name)}" for name in STRUCTURED_FIELDS if getattr(record, name, None) is not None]
+        return f"{message} | {' '.join(fields)}" if fields else message
+
+# 超過大小上限或者過咗午夜就輪替；備份按編號 bot.log.1、bot.log.2… 順延，唔會互相覆蓋
+class RotatingLogHandler(RotatingFileHandler):
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        # 重啟時用現有日誌檔最後修改嗰日，隔日先開機都會輪替
+        started = os.path.getmtime(self.baseFilename) if os.path.exists(self.baseFilename) else time.time()
+        self._day = time.strftime('%Y-%m-%d', time.localtime(started))
+
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        if time.strftime('%Y-%m-%d') != self._day:
+            if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+                return 1
+            self._day = time.strftime('%Y-%m-%d')
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self._day = time.strftime('%Y-%m-%d')
+
+# 所有 logger 只寫入隊列，由單一背景線程寫檔，唔會喺 event loop 做磁碟 I/O
+def setup_logging(level: int = logging.INFO) -> QueueListener:
+    global _listener
+    if _listener is not None:
+        return _listener
+    file_handler = RotatingLogHandler(LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT)
+    file_handler.setFormatter(StructuredFormatter(LOG_FORMAT))
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
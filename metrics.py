@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import re
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger('metrics')
+
+# 每個直方圖保留最近幾多個樣本計百分位
+RESERVOIR_SIZE = 1024
+# 事件循環延遲量度間隔（秒）
+LOOP_LAG_INTERVAL = 1.0
+
+# 延遲直方圖：累計次數同總和，百分位用最近 RESERVOIR_SIZE 個樣本
+class Histogram:
+    __slots__ = ('count', 'total', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def percentiles(self, *quantiles: float) -> list:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return [0.0 for _ in quantiles]
+        return [ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in quantiles]
+
+_histograms: Dict[str, Histogram] = defaultdict(Histogram)
+_counters: Dict[str, int] = defaultdict(int)
+# 名 -> 返回 {指標: 數值} 嘅函數（例如快取統計）
+_gauge_sources: Dict[str, Callable[[], dict]] = {}
+_lag_task: Optional[asyncio.Task] = None
+_http_runner = None
+
+def observe(name: str, seconds: float):
+    _histograms[name].observe(seconds)
+
+def increment(name: str, amount: int = 1):
+    _counters[name] += amount
+
+@contextmanager
+def timer(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+# 將 URL 轉成端點名，數字 ID 合併，避免每支球隊一個直方圖
+def endpoint_name(url: str) -> str:
+    url = re.sub(r'^https?://', '', url.split('?', 1)[0])
+    return re.sub(r'/\d+(?=/|$)', '/{id}', url)
+
+def add_gauge_source(name: str, source: Callable[[], dict]):
+    _gauge_sources[name] = source
+
+def _gauges() -> Dict[str, dict]:
+    gauges = {}
+    for name, source in _gauge_sources.items():
+        try:
+            gauges[name] = source()
+        except Exception as e:
+            logger.error(f"讀取指標 {name} 失敗: {e}")
+    return gauges
+
+# 事件循環延遲：sleep 實際多咗幾耐
+async def _measure_loop_lag():
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        observe('event_loop_lag', max(0.0, time.perf_counter() - started - LOOP_LAG_INTERVAL))
+
+def start_loop_monitor():
+    global _lag_task
+    if _lag_task is None or _lag_task.done():
+        _lag_task = asyncio.ensure_future(_measure_loop_lag())
+
+def stop_loop_monitor():
+    global _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
+
+# /bot_stats 用嘅文字報告
+def render_text(prefix: str = '') -> str:
+    lines = ["📊 延遲（毫秒） p50 / p95 / p99 (次數):"]
+    for name in sorted(_histograms):
+        if not name.startswith(prefix):
+            continue
+        histogram = _histograms[name]
+        p50, p95, p99 = histogram.percentiles(0.5, 0.95, 0.99)
+        lines.append(f"`{name}` {p50 * 1000:.0f} / {p95 * 1000:.0f} / {p99 * 1000:.0f} ({histogram.count})")
+    if _counters:
+        lines.append("\n🔢 計數:")
+        lines.extend(f"`{name}` {value}" for name, value in sorted(_counters.items()))
+    for name, values in _gauges().items():
+        lines.append(f"\n📦 {name}:")
+        lines.append(' '.join(f"{key}={round(value, 3) if isinstance(value, float) else value}" for key, value in values.items()))
+    return '\n'.join(lines)
+
+def _prometheus_name(name: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name).strip('_')
+
+# Prometheus 文字格式
+def render_prometheus() -> str:
+    lines = []
+    for name, histogram in sorted(_histograms.items()):
+        label = name.replace('"', '')
+        for quantile, value in zip((0.5, 0.95, 0.99), histogram.percentiles(0.5, 0.95, 0.99)):
+            lines.append(f'bot_latency_seconds{{name="{label}",quantile="{quantile}"}} {value:.6f}')
+        lines.append(f'bot_latency_seconds_count{{name="{label}"}} {histogram.count}')
+        lines.append(f'bot_latency_seconds_sum{{name="{label}"}} {histogram.total:.6f}')
+    for name, value in sorted(_counters.items()):
+        lines.append(f'bot_events_total{{name="{name}"}} {value}')
+    for source, values in _gauges().items():
+        for key, value in values.items():
+            if isinstance(value, (int, float)):
+                lines.append(f'bot_{_prometheus_name(source)}_{_prometheus_name(key)} {value}')
+    return '\n'.join(lines) + '\n'
+
+# 可選嘅本地 /metrics 端點（只綁 127.0.0.1）
+async def start_http_server(port: int, host: str = '127.0.0.1'):
+    global _http_runner
+    if _http_runner is not None:
+        return
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=render_prometheus(), content_type='text/plain')
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    _http_runner = web.AppRunner(app)
+    await _http_runner.setup()
+    await web.TCPSite(_http_runner, host, port).start()
+    logger.info(f"指標端點: http://{host}:{port}/metrics")
+
+async def stop_http_server():
+    global _http_runner
+    if _http_runner is not None:
+        await _http_runner.cleanup()
+        _http_runner = None
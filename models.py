@@ -0,0 +1,201 @@
+import functools
+import time
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from emojis import COUNTRY_FLAGS, TEAM_EMOJIS, LEAGUE_EMOJI
+
+DEFAULT_TIMEZONE = 'Asia/Hong_Kong'
+# 時間格式：key -> (顯示名, strftime 格式)
+TIME_FORMATS = {
+    'dmy': ('日/月 24小時', '%d/%m %H:%M'),
+    'mdy': ('月/日 12小時', '%m/%d %I:%M %p'),
+    'iso': ('年-月-日 24小時', '%Y-%m-%d %H:%M'),
+}
+DEFAULT_TIME_FORMAT = 'dmy'
+# (時區, 時間格式 key)；渲染快取同時區轉換都用呢個做 key
+DEFAULT_LOCALE = (DEFAULT_TIMEZONE, DEFAULT_TIME_FORMAT)
+
+# 時區物件只建立一次
+@functools.lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+# zoneinfo 靠系統時區資料庫；Windows 等冇內置資料庫嘅環境要裝 tzdata 套件，否則所有時區都用唔到
+try:
+    HKT = get_zone(DEFAULT_TIMEZONE)
+except ZoneInfoNotFoundError:
+    raise RuntimeError("搵唔到時區資料庫，請執行 pip install tzdata 之後再啟動") from None
+
+# 解析 ISO 時間（支援 'Z' 結尾），失敗返回 None
+def parse_utc(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+# 一次過將一批UTC時間轉為本地時間字串；同一開賽時間只轉換一次
+def format_times(values: Iterable[Optional[datetime]], locale: Tuple[str, str] = DEFAULT_LOCALE) -> List[str]:
+    zone = get_zone(locale[0])
+    fmt = TIME_FORMATS.get(locale[1], TIME_FORMATS[DEFAULT_TIME_FORMAT])[1]
+    converted: Dict[Optional[datetime], str] = {}
+    result = []
+    for value in values:
+        text = converted.get(value)
+        if text is None:
+            try:
+                text = value.astimezone(zone).strftime(fmt)
+            except (AttributeError, ValueError, OverflowError):
+                text = "時間格式錯誤"
+            converted[value] = text
+        result.append(text)
+    return result
+
+# 足球比賽（時間同emoji喺建立時解析一次）
+class Match:
+    __slots__ = (
+        'id', 'competition_code', 'competition_name', 'league_emoji',
+        'home', 'away', 'home_id', 'away_id', 'home_emoji', 'away_emoji',
+        'kickoff', 'ts', 'status', 'score_home', 'score_away',
+    )
+
+    def __init__(self, raw: dict):
+        competition = raw.get('competition') or {}
+        home_team = raw.get('homeTeam') or {}
+        away_team = raw.get('awayTeam') or {}
+        full_time = (raw.get('score') or {}).get('fullTime') or {}
+        self.id = raw.get('id')
+        self.competition_code = competition.get('code')
+        self.competition_name = competition.get('name')
+        self.league_emoji = LEAGUE_EMOJI.get(self.competition_code, '')
+        self.home = home_team.get('shortName') or home_team.get('name')
+        self.away = away_team.get('shortName') or away_team.get('name')
+        self.home_id = home_team.get('id')
+        self.away_id = away_team.get('id')
+        self.home_emoji = TEAM_EMOJIS.get(self.home, '')
+        self.away_emoji = TEAM_EMOJIS.get(self.away, '')
+        self.kickoff = parse_utc(raw.get('utcDate'))
+        self.ts = self.kickoff.timestamp() if self.kickoff else 0.0
+        self.status = raw.get('status')
+        self.score_home = full_time.get('home')
+        self.score_away = full_time.get('away')
+
+# F1分站
+class Race:
+    __slots__ = ('round', 'name', 'country', 'flag', 'kickoff', 'ts', 'quali_kickoff')
+
+    def __init__(self, raw: dict):
+        country = ((raw.get('Circuit') or {}).get('Location') or {}).get('country')
+        qualifying = raw.get('Qualifying') or {}
+        self.round = raw.get('round')
+        self.name = raw.get('raceName')
+        self.country = country
+        self.flag = COUNTRY_FLAGS.get(country, '🏳️')
+        self.kickoff = parse_utc(f"{raw.get('date')}T{raw.get('time', '00:00:00Z')}")
+        self.ts = self.kickoff.timestamp() if self.kickoff else 0.0
+        self.quali_kickoff = parse_utc(f"{qualifying['date']}T{qualifying.get('time', '00:00:00Z')}") if qualifying.get('date') else None
+
+# 積分榜一行
+class Standing:
+    __slots__ = ('position', 'team_id', 'name', 'short_name', 'emoji', 'points', 'played')
+
+    def __init__(self, raw: dict):
+        team = raw.get('team') or {}
+        self.position = raw.get('position')
+        self.team_id = team.get('id')
+        self.name = team.get('name')
+        self.short_name = team.get('shortName') or self.name
+        self.emoji = TEAM_EMOJIS.get(self.name, '')
+        self.points = raw.get('points')
+        self.played = raw.get('playedGames')
+
+    @staticmethod
+    def from_payload(data: dict) -> List['Standing']:
+        standings = data.get('standings') or [{}]
+        return [Standing(raw) for raw in standings[0].get('table', [])]
+
+# F1車手積分榜一行
+class DriverStanding:
+    __slots__ = ('position', 'name', 'nationality', 'flag', 'points')
+
+    def __init__(self, raw: dict):
+        driver = raw.get('Driver') or {}
+        self.position = raw.get('position')
+        self.name = f"{driver.get('givenName', '')} {driver.get('familyName', '')}".strip()
+        self.nationality = driver.get('nationality')
+        self.flag = COUNTRY_FLAGS.get(self.nationality, '🏳️')
+        self.points = raw.get('points')
+
+    @staticmethod
+    def from_payload(data: dict) -> List['DriverStanding']:
+        lists = data['MRData']['StandingsTable']['StandingsLists']
+        return [DriverStanding(raw) for raw in lists[0]['DriverStandings']] if lists else []
+
+# 按開賽時間排序嘅索引，查「之後N場」只需 bisect
+class SortedTimeline:
+    __slots__ = ('items', 'times')
+
+    def __init__(self, items: Iterable):
+        self.items = sorted(items, key=lambda item: item.ts)
+        self.times = [item.ts for item in self.items]
+
+    def upcoming(self, now: Optional[float] = None, limit: Optional[int] = None) -> list:
+        start = bisect_right(self.times, time.time() if now is None else now)
+        end = len(self.items) if limit is None else start + limit
+        return self.items[start:end]
+
+    def count_upcoming(self, now: Optional[float] = None) -> int:
+        return len(self.items) - bisect_right(self.times, time.time() if now is None else now)
+
+# 比賽索引：全部、按聯賽、按球隊、按狀態
+class MatchIndex:
+    __slots__ = ('all', 'by_competition', 'by_team', 'by_status')
+
+    def __init__(self, matches: Iterable[Match]):
+        self.all = SortedTimeline(matches)
+        grouped: Dict[str, Dict[object, list]] = {'competition': {}, 'team': {}, 'status': {}}
+        for match in self.all.items:
+            grouped['competition'].setdefault(match.competition_code, []).append(match)
+            grouped['status'].setdefault(match.status, []).append(match)
+            for team_id in (match.home_id, match.away_id):
+                grouped['team'].setdefault(team_id, []).append(match)
+        self.by_competition = {key: SortedTimeline(items) for key, items in grouped['competition'].items()}
+        self.by_team = {key: SortedTimeline(items) for key, items in grouped['team'].items()}
+        self.by_status = {key: SortedTimeline(items) for key, items in grouped['status'].items()}
+
+    @classmethod
+    def from_payload(cls, data: dict) -> 'MatchIndex':
+        return cls(Match(raw) for raw in data.get('matches', []))
+
+    def _timeline(self, competition: Optional[str] = None, team: Optional[int] = None,
+                  status: Optional[str] = None) -> SortedTimeline:
+        if team is not None:
+            timeline = self.by_team.get(team, _EMPTY)
+            if competition is not None:
+                return SortedTimeline(m for m in timeline.items if m.competition_code == competition)
+            return timeline
+        if competition is not None:
+            return self.by_competition.get(competition, _EMPTY)
+        if status is not None:
+            return self.by_status.get(status, _EMPTY)
+        return self.all
+
+    def upcoming(self, limit: Optional[int] = None, now: Optional[float] = None, **filters) -> List[Match]:
+        return self._timeline(**filters).upcoming(now, limit)
+
+    def count_upcoming(self, now: Optional[float] = None, **filters) -> int:
+        return self._timeline(**filters).count_upcoming(now)
+
+# F1賽季索引
+class RaceIndex(SortedTimeline):
+    __slots__ = ()
+
+    @classmethod
+    def from_payload(cls, data: dict) -> 'RaceIndex':
+        return cls(Race(raw) for raw in data['MRData']['RaceTable']['Races'])
+
+_EMPTY = SortedTimeline(())
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import sports_api
+from models import MatchIndex
+
+logger = logging.getLogger('poller')
+
+# 輪詢間隔（秒）
+LIVE_INTERVAL = 30          # 有比賽進行中
+MATCHDAY_INTERVAL = 300     # 今日仲有比賽
+IDLE_INTERVAL = 1800        # 深夜／無比賽
+KICKOFF_SOON = 3 * 3600     # 下場開賽少於3粒鐘就當係比賽日
+# 開賽時間過咗但上游仲係 SCHEDULED/TIMED（狀態會遲幾分鐘更新），呢段時間內當進行中
+KICKOFF_GRACE = 150 * 60
+
+# 預取清單：(來源, 路徑, 比賽進行中間隔, 平時間隔)
+JOBS = [
+    ('football', 'matches', LIVE_INTERVAL, None),
+    ('football', 'competitions/PL/standings', 600, 3600),
+    ('football', 'competitions/PL/matches?status=SCHEDULED', 1800, 3600),
+    ('football', 'teams/64/matches?status=SCHEDULED', 1800, 3600),
+    ('ergast', 'current.json', 21600, 21600),
+    ('ergast', 'current/driverStandings.json', 3600, 3600),
+]
+
+_task: Optional[asyncio.Task] = None
+_next_run = {}
+# path -> [async callback(MatchIndex)]，每次該 feed 更新後呼叫
+_listeners: Dict[str, List[Callable[[MatchIndex], Awaitable[None]]]] = {}
+live = False
+next_kickoff: Optional[float] = None
+
+# 根據即時比賽索引判斷下次輪詢間隔（開賽時間已經喺索引解析好）
+def _update_state(index: MatchIndex):
+    global live, next_kickoff
+    now = time.time()
+    live = False
+    next_kickoff = None
+    for match in index.all.items:
+        if match.status in ('IN_PLAY', 'PAUSED'):
+            live = True
+        elif match.status in ('SCHEDULED', 'TIMED') and match.kickoff is not None:
+            if match.ts <= now:
+                if now - match.ts < KICKOFF_GRACE:
+                    live = True
+            elif next_kickoff is None or match.ts < next_kickoff:
+                next_kickoff = match.ts
+
+def _interval(source: str, path: str, live_interval: int, idle_interval: Optional[int]) -> int:
+    if idle_interval is None:
+        # 即時比賽 feed：按賽況自動調整
+        if live:
+            return live_interval
+        if next_kickoff is not None and next_kickoff - time.time() < KICKOFF_SOON:
+            # 開賽前後跟得密啲
+            return min(MATCHDAY_INTERVAL, max(live_interval, int(next_kickoff - time.time())))
+        return IDLE_INTERVAL
+    return live_interval if live else idle_interval
+
+async def _run_job(source: str, path: str, interval: int):
+    # 快取時間比輪詢間隔長，等斜線命令一定由本地資料即時回覆
+    ttl = interval * 2 + 60
+    started = time.monotonic()
+    # 多個分片進程：其他進程呢個間隔內已經更新過就直接用共用快取
+    if source == 'football':
+        data = await sports_api.refresh_football(path, ttl, max_age=interval)
+    else:
+        data = await sports_api.refresh_ergast(path, ttl, max_age=interval)
+    logger.debug(f"預取 {path} 完成，用時 {time.monotonic() - started:.2f}s")
+    if path == 'matches' or _listeners.get(path):
+        index = await sports_api.get_match_index(path)
+        if path == 'matches':
+            _update_state(index)
+        for callback in _listeners.get(path, []):
+            try:
+                await callback(index)
+            except Exception as e:
+                logger.error(f"處理 {path} 更新失敗: {e}")
+    return data
+
+# 登記 feed 更新後要跑嘅回呼（例如即時比賽推送）
+def add_listener(path: str, callback: Callable[[MatchIndex], Awaitable[None]]):
+    _listeners.setdefault(path, []).append(callback)
+
+async def _loop():
+    while True:
+        now = time.monotonic()
+        for source, path, live_interval, idle_interval in JOBS:
+            if _next_run.get(path, 0) > now:
+                continue
+            interval = _interval(source, path, live_interval, idle_interval)
+            try:
+                await _run_job(source, path, interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"預取 {path} 失敗: {e}")
+                interval = min(interval, LIVE_INTERVAL * 2)
+            else:
+                # 即時 feed 更新後賽況可能變咗，重新計間隔
+                interval = _interval(source, path, live_interval, idle_interval)
+            _next_run[path] = time.monotonic() + interval
+        await asyncio.sleep(max(1.0, min(_next_run.values()) - time.monotonic()))
+
+# 喺 on_ready 啟動；重連時重複呼叫唔會開多個任務
+def start():
+    global _task
+    if _task is None or _task.done():
+        # 由快照載入嘅資料仲新鮮就唔使即刻重新請求
+        snapshot = sports_api.peek_match_index('matches')
+        if snapshot is not None:
+            _update_state(snapshot)
+        now = time.monotonic()
+        for source, path, live_interval, idle_interval in JOBS:
+            age = sports_api.cache_age(source, path)
+            if age is not None and path not in _next_run:
+                _next_run[path] = now + max(0.0, _interval(source, path, live_interval, idle_interval) - age)
+        _task = asyncio.ensure_future(_loop())
+        logger.info("背景預取已啟動")
+
+def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        _task = None
@@ -0,0 +1,173 @@
+import time
+from typing import List, Optional, Tuple
+
+import live_board
+import render
+import sports_api
+from emojis import LEAGUE_EMOJI
+from models import DEFAULT_LOCALE, format_times
+from render import paginate
+
+# 聯賽中文名
+COMPETITION_LABELS = {
+    'PL': '英超', 'PD': '西甲', 'BL1': '德甲', 'SA': '意甲', 'FL1': '法甲', 'DED': '荷甲',
+    'PPL': '葡超', 'ELC': '英冠', 'BSA': '巴甲', 'CL': '歐聯', 'EC': '歐國盃', 'WC': '世界盃',
+}
+# 球隊中文名（team_id -> 名）
+TEAM_LABELS = {
+    64: '利物浦',
+}
+
+class QueryError(Exception):
+    pass
+
+def competition_label(code: str) -> str:
+    return COMPETITION_LABELS.get(code, sports_api.COMPETITIONS.get(code, code))
+
+def team_label(team_id: int) -> str:
+    return TEAM_LABELS.get(team_id) or sports_api.known_teams().get(team_id) or str(team_id)
+
+# 將自動完成嘅 team_id 或者輸入嘅名轉為 team_id
+def resolve_team(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    lowered = value.lower()
+    for team_id, label in TEAM_LABELS.items():
+        if label == value:
+            return team_id
+    teams = sports_api.known_teams()
+    for team_id, name in teams.items():
+        if name and name.lower() == lowered:
+            return team_id
+    for team_id, name in teams.items():
+        if name and lowered in name.lower():
+            return team_id
+    raise QueryError(f"搵唔到球隊「{value}」，請喺自動完成清單揀選")
+
+# 球隊自動完成選項：(名, team_id)
+def team_choices(current: str) -> List[tuple]:
+    current = current.lower()
+    teams = sports_api.known_teams()
+    for team_id, label in TEAM_LABELS.items():
+        teams.setdefault(team_id, label)
+    ordered = sorted(teams.items(), key=lambda item: item[1] or '')
+    return [(name, str(team_id)) for team_id, name in ordered if name and current in name.lower()][:25]
+
+# 揀資料來源：有聯賽就用聯賽賽程（同一份資料可以答晒該聯賽所有球隊），淨係球隊先用球隊賽程
+def _matches_path(competition: Optional[str], team: Optional[int]) -> str:
+    if competition:
+        return f"competitions/{competition}/matches?status=SCHEDULED"
+    if team is not None:
+        return f"teams/{team}/matches?status=SCHEDULED"
+    raise QueryError("請揀聯賽或者球隊")
+
+def _title(competition: Optional[str], team: Optional[int]) -> str:
+    if team is not None and competition:
+        return f"{team_label(team)}（{competition_label(competition)}）"
+    if team is not None:
+        return team_label(team)
+    return competition_label(competition)
+
+# 「之後N場」喺第一場開賽之前都唔會變，渲染結果有效到嗰陣
+def _valid_until_first(items: list) -> Optional[float]:
+    return items[0].ts - time.time() if items else None
+
+def _render_schedule(index, competition: Optional[str], team: Optional[int], limit: int, locale: Tuple[str, str]):
+    matches = index.upcoming(limit=limit, competition=competition, team=team)
+    remaining = index.count_upcoming(competition=competition, team=team)
+    emoji = LEAGUE_EMOJI.get(competition, '') if competition else ''
+    header = f"{emoji} {_title(competition, team)}賽程（最近{limit}場）:\n".lstrip()
+    if not matches:
+        return [header + "暫無未來賽程\n" + f"📅 剩餘比賽數: {remaining} 場"], None
+    times = format_times((m.kickoff for m in matches), locale)
+    blocks = [f"{kickoff} \n{m.home_emoji}{m.home} vs {m.away_emoji}{m.away}\n\n" for m, kickoff in zip(matches, times)]
+    blocks.append(f"📅 剩餘比賽數: {remaining} 場")
+    return paginate(blocks, header=header), _valid_until_first(matches)
+
+# 賽程：最近 limit 場
+async def schedule_pages(competition: Optional[str] = None, team: Optional[int] = None, limit: int = 10,
+                         locale: Tuple[str, str] = DEFAULT_LOCALE) -> List[str]:
+    path = _matches_path(competition, team)
+    index = await sports_api.get_match_index(path)
+    version = sports_api.data_version('football', path, index)
+    return render.cached_pages(('schedule', competition, team, limit), version,
+                               lambda: _render_schedule(index, competition, team, limit, locale), locale)
+
+def _render_next(index, competition: Optional[str], team: Optional[int], limit: int, locale: Tuple[str, str]):
+    matches = index.upcoming(limit=limit, competition=competition, team=team)
+    title = _title(competition, team)
+    header = f"{title}下場比賽:\n" if limit == 1 else f"{title}下{limit}場比賽:\n"
+    if not matches:
+        return [header + "暫無未來比賽\n"], None
+    times = format_times((m.kickoff for m in matches), locale)
+    blocks = [f"📅 {kickoff}\n{m.home_emoji}{m.home} 🆚 {m.away_emoji}{m.away}\n\n" for m, kickoff in zip(matches, times)]
+    return paginate(blocks, header=header), _valid_until_first(matches)
+
+# 下場（或下 limit 場）比賽
+async def next_pages(competition: Optional[str] = None, team: Optional[int] = None, limit: int = 1,
+                     locale: Tuple[str, str] = DEFAULT_LOCALE) -> List[str]:
+    path = _matches_path(competition, team)
+    index = await sports_api.get_match_index(path)
+    version = sports_api.data_version('football', path, index)
+    return render.cached_pages(('next', competition, team, limit), version,
+                               lambda: _render_next(index, competition, team, limit, locale), locale)
+
+def _render_standings(table: list, competition: str):
+    header = f"{LEAGUE_EMOJI.get(competition, '')}🏆 {competition_label(competition)}積分榜:\n"
+    if not table:
+        return [header + "暫無積分榜\n"], None
+    blocks = [f"{row.position}. {row.emoji} {row.name} - {row.points} 分\n" for row in table]
+    return paginate(blocks, header=header), None
+
+# 積分榜
+async def standings_pages(competition: str) -> List[str]:
+    table = await sports_api.get_standings(competition)
+    version = sports_api.data_version('football', f"competitions/{competition}/standings", table)
+    return render.cached_pages(('standings', competition), version, lambda: _render_standings(table, competition))
+
+# 今日賽程（同即時比分板共用渲染結果）
+async def today_pages(competition: Optional[str] = None, locale: Tuple[str, str] = DEFAULT_LOCALE) -> List[str]:
+    index = await sports_api.get_match_index("matches")
+    return live_board.today_pages(index, competition, locale)
+
+def _render_f1_schedule(index, limit: int, locale: Tuple[str, str]):
+    races = index.upcoming(limit=limit)
+    remaining = index.count_upcoming()
+    header = f"🏎️ F1賽程（最近{limit}場）:\n"
+    times = format_times((race.kickoff for race in races), locale)
+    blocks = [f"{kickoff} {race.flag} {race.name}\n" for race, kickoff in zip(races, times)] or ["暫無未來賽程\n"]
+    blocks.append(f"📅 剩餘比賽數: {remaining} 場")
+    return paginate(blocks, header=header), _valid_until_first(races)
+
+# F1賽程（最近 limit 場未來比賽）
+async def f1_schedule_pages(limit: int = 5, locale: Tuple[str, str] = DEFAULT_LOCALE) -> List[str]:
+    index = await sports_api.get_race_index("current.json")
+    version = sports_api.data_version('ergast', "current.json", index)
+    return render.cached_pages(('f1_schedule', limit), version, lambda: _render_f1_schedule(index, limit, locale), locale)
+
+def _render_f1_next(index, locale: Tuple[str, str]):
+    upcoming = index.upcoming(limit=1)
+    if not upcoming:
+        return ["F1下場比賽: 暫無未來比賽"], None
+    race = upcoming[0]
+    kickoff, qualifying = format_times((race.kickoff, race.quali_kickoff), locale)
+    return [f"F1下場比賽: \n{kickoff} \n{race.flag} {race.name}\n排位賽: {qualifying}"], _valid_until_first(upcoming)
+
+# F1下場比賽（含排位賽時間）
+async def f1_next_pages(locale: Tuple[str, str] = DEFAULT_LOCALE) -> List[str]:
+    index = await sports_api.get_race_index("current.json")
+    version = sports_api.data_version('ergast', "current.json", index)
+    return render.cached_pages(('f1_next',), version, lambda: _render_f1_next(index, locale), locale)
+
+def _render_f1_standings(table: list, limit: int):
+    blocks = [f"{row.flag} {row.name} - {row.points} 分\n" for row in table[:limit]]
+    return paginate(blocks, header=f"🏆 F1車手積分榜（頭{limit}）:\n"), None
+
+# F1車手積分榜（頭 limit 名）
+async def f1_standings_pages(limit: int = 10) -> List[str]:
+    table = await sports_api.get_driver_standings("current/driverStandings.json")
+    version = sports_api.data_version('ergast', "current/driverStandings.json", table)
+    return render.cached_pages(('f1_standings', limit), version, lambda: _render_f1_standings(table, limit))
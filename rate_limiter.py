@@ -0,0 +1,105 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Mapping, Optional
+
+logger = logging.getLogger('rate_limiter')
+
+# 優先次序：數字越細越先
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+class RateLimited(Exception):
+    pass
+
+# Token bucket 排程器：按優先次序排隊，並根據上游回應標頭校正剩餘配額
+class QuotaScheduler:
+    def __init__(self, rate_per_minute: int = 10):
+        self.capacity = rate_per_minute
+        self.refill_rate = rate_per_minute / 60.0
+        self.tokens = float(rate_per_minute)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters = []
+        self._counter = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.throttled = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    # 等待一個請求配額；超過 timeout 就拋出 RateLimited
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None):
+        self._refill()
+        if not self._waiters and self.tokens >= 1 and time.monotonic() >= self._blocked_until:
+            self.tokens -= 1
+            return
+        self.throttled += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._ensure_dispatcher()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # 啱啱超時嗰刻拎到配額，照用
+                return
+            future.cancel()
+            raise RateLimited(f"等候配額超過 {timeout} 秒")
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self):
+        while self._waiters:
+            self._refill()
+            now = time.monotonic()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+            while self._waiters and self.tokens >= 1:
+                _, _, future = heapq.heappop(self._waiters)
+                if future.done():
+                    continue
+                future.set_result(None)
+                self.tokens -= 1
+            if self._waiters:
+                await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+
+    # 根據 football-data.org 回應標頭同步配額
+    def update_from_headers(self, headers: Mapping[str, str], status: int = 200):
+        available = headers.get('X-Requests-Available-Minute')
+        reset = headers.get('X-RequestCounter-Reset')
+        self._refill()
+        exhausted = False
+        if available is not None:
+            try:
+                self.tokens = min(self.tokens, float(available))
+                exhausted = float(available) < 1
+            except ValueError:
+                pass
+        # 只有上游話配額用盡先封鎖；本地 token 因並發 429 歸零唔代表要等到重置
+        if status == 429 or exhausted:
+            try:
+                wait = float(reset) if reset is not None else 60.0
+            except ValueError:
+                wait = 60.0
+            self.tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + wait)
+            logger.warning(f"football-data 配額用盡，{wait:.0f} 秒後重置")
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            'tokens': round(self.tokens, 2),
+            'queued': sum(1 for _, _, f in self._waiters if not f.done()),
+            'throttled': self.throttled,
+        }
@@ -0,0 +1,42 @@
+from typing import Callable, Hashable, List, Optional, Tuple
+
+import metrics
+from cache import TTLCache
+from models import DEFAULT_LOCALE
+
+MESSAGE_LIMIT = 2000
+# 冇開賽時間限制嘅渲染結果（例如積分榜）最多留幾耐；資料版本一變就唔會再命中
+RENDER_TTL = 6 * 3600
+
+# (命令, 資料版本, (時區, 時間格式)) -> 已分頁訊息
+_pages = TTLCache(maxsize=512)
+
+# 將多段文字拼成唔超過 limit 嘅頁面，唔會將一段拆開
+def paginate(blocks: List[str], header: str = '', limit: int = MESSAGE_LIMIT) -> List[str]:
+    pages = []
+    current = header
+    for block in blocks:
+        if len(current) + len(block) > limit and current.strip():
+            pages.append(current)
+            current = ''
+        current += block[:limit]
+    if current or not pages:
+        pages.append(current)
+    return pages
+
+# 同一命令、同一版本資料、同一時區格式直接返回上次嘅結果；同時區嘅伺服器共用
+# build 返回 (頁面, 有效秒數)；有效秒數係 None 代表只跟資料版本；version 係 None 就唔快取
+def cached_pages(command: Tuple[Hashable, ...], version: Optional[str],
+                 build: Callable[[], Tuple[List[str], Optional[float]]], locale: Tuple[str, str] = DEFAULT_LOCALE) -> List[str]:
+    if version is None:
+        return build()[0]
+    key = (command, version, locale)
+    pages = _pages.get_fresh(key)
+    if pages is None:
+        with metrics.timer(f"render {command[0]}"):
+            pages, valid_for = build()
+        _pages.set(key, pages, RENDER_TTL if valid_for is None else max(0.0, valid_for))
+    return pages
+
+def stats() -> dict:
+    return _pages.stats()
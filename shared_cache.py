@@ -0,0 +1,64 @@
+import asyncio
+import os
+import socket
+import time
+from typing import Optional, Tuple
+
+import cache_store
+
+# local：單一進程（預設）；sqlite：多個分片進程共用磁碟快照做快取同配額
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'sqlite' if os.getenv('SHARD_IDS') else 'local')
+# 一個進程最多霸住某個 URL 幾耐（秒）：等配額30秒 + 請求10秒，超過就當佢死咗，由其他進程接手
+FETCH_LEASE = 45
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+# 單一進程：本地 TTLCache 同 QuotaScheduler 已經夠，乜都唔使協調
+class LocalBackend:
+    shared = False
+
+    async def lookup(self, key: str, max_age: float) -> Optional[Tuple[dict, float, Optional[str], Optional[str]]]:
+        return None
+
+    async def claim(self, key: str, lease: float = FETCH_LEASE) -> bool:
+        return True
+
+    async def release(self, key: str):
+        pass
+
+    async def take_token(self, bucket: str, rate_per_minute: int) -> float:
+        return 0.0
+
+    async def block(self, bucket: str, seconds: float):
+        pass
+
+# 多進程：同一個 SQLite 檔（WAL 模式）做共用回應快取、上游請求租約同 token bucket
+class SqliteBackend:
+    shared = True
+
+    async def lookup(self, key: str, max_age: float) -> Optional[Tuple[dict, float, Optional[str], Optional[str]]]:
+        return await asyncio.to_thread(cache_store.fresh, key, max_age)
+
+    async def claim(self, key: str, lease: float = FETCH_LEASE) -> bool:
+        return await asyncio.to_thread(cache_store.claim, f"fetch:{key}", OWNER, lease)
+
+    async def release(self, key: str):
+        await asyncio.to_thread(cache_store.release, f"fetch:{key}", OWNER)
+
+    async def take_token(self, bucket: str, rate_per_minute: int) -> float:
+        return await asyncio.to_thread(cache_store.take_token, bucket, float(rate_per_minute), rate_per_minute / 60.0)
+
+    async def block(self, bucket: str, seconds: float):
+        await asyncio.to_thread(cache_store.block, bucket, time.time() + seconds)
+
+BACKENDS = {
+    'local': LocalBackend,
+    'sqlite': SqliteBackend,
+}
+
+def create(name: str):
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"未知嘅快取後端: {name}（可選: {', '.join(BACKENDS)}）") from None
+
+backend = create(CACHE_BACKEND)
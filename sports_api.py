@@ -0,0 +1,305 @@
+import asyncio
+import hashlib
+import json
+import os
+import logging
+import time
+from typing import Optional
+
+import aiohttp
+
+import cache_store
+import http_client
+import metrics
+import rate_limiter
+import shared_cache
+from cache import TTLCache
+from models import DriverStanding, MatchIndex, RaceIndex, Standing
+
+logger = logging.getLogger('sports_api')
+
+# 可以用環境變量指向本地 stub（bench 用）
+FOOTBALL_API_BASE = os.getenv('FOOTBALL_API_BASE', 'https://api.football-data.org/v4/')
+ERGAST_API_BASE = os.getenv('ERGAST_API_BASE', 'https://api.jolpi.ca/ergast/f1/')
+
+# football-data.org 免費版提供嘅聯賽
+COMPETITIONS = {
+    'PL': 'Premier League',
+    'PD': 'La Liga',
+    'BL1': 'Bundesliga',
+    'SA': 'Serie A',
+    'FL1': 'Ligue 1',
+    'DED': 'Eredivisie',
+    'PPL': 'Primeira Liga',
+    'ELC': 'Championship',
+    'BSA': 'Brasileirão',
+    'CL': 'Champions League',
+    'EC': 'European Championship',
+    'WC': 'World Cup',
+}
+
+# 每種端點嘅快取時間（秒），按次序配對，第一個符合嘅生效
+ENDPOINT_TTLS = [
+    ('status=SCHEDULED', 600),   # 賽程
+    ('/standings', 600),         # 足球積分榜
+    ('driverStandings', 900),    # F1車手榜
+    ('current.json', 3600),      # F1賽季賽程
+]
+LIVE_TTL = 30  # 即時比賽（/v4/matches 等）
+
+# football-data.org 免費版每分鐘10次
+FOOTBALL_RATE_PER_MINUTE = int(os.getenv('FOOTBALL_RATE_PER_MINUTE', '10'))
+# 互動請求最多等幾耐配額（defer 之後有15分鐘，唔使急住失敗）
+QUOTA_WAIT_TIMEOUT = 30
+# 多進程模式：等其他進程攞資料時幾耐睇一次共用快取（秒）
+SHARED_POLL_INTERVAL = 0.25
+
+response_cache = TTLCache(maxsize=128)
+# 已解析嘅索引：url -> (原始資料, 索引)，原始資料換咗先重新解析
+_parsed = {}
+# 內容版本：url -> (原始資料, hash)，內容一樣嘅重新下載仍然係同一版本
+_versions = {}
+# 條件請求用：url -> (ETag, Last-Modified)
+_validators = {}
+_pending_writes = set()
+football_quota = rate_limiter.QuotaScheduler(FOOTBALL_RATE_PER_MINUTE)
+
+def ttl_for(url: str) -> int:
+    for pattern, ttl in ENDPOINT_TTLS:
+        if pattern in url:
+            return ttl
+    return LIVE_TTL
+
+# 啟動時由磁碟快照載入，唔使等網絡就可以回覆
+def load_persisted():
+    count = 0
+    for url, data, age, etag, last_modified in cache_store.load(response_cache.max_stale):
+        response_cache.set(url, data, ttl_for(url), age=age)
+        _validators[url] = (etag, last_modified)
+        count += 1
+    logger.info(f"由快照載入 {count} 個回應")
+
+def _persist(func, *args) -> asyncio.Future:
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+    return task
+
+# 等所有背景快照寫入完成（關閉資料庫前用）；等待期間完成嘅更新再排嘅寫入都會等埋
+async def flush():
+    while _pending_writes:
+        await asyncio.gather(*_pending_writes, return_exceptions=True)
+
+# 帶 ETag/Last-Modified 嘅條件請求；304 就沿用快取資料，新資料寫入磁碟快照
+async def _fetch_conditional(url: str, headers: Optional[dict] = None):
+    request_headers = dict(headers or {})
+    cached = response_cache.peek(url)
+    etag, last_modified = _validators.get(url, (None, None))
+    if cached is not None:
+        if etag:
+            request_headers['If-None-Match'] = etag
+        if last_modified:
+            request_headers['If-Modified-Since'] = last_modified
+    started = time.perf_counter()
+    data, response_headers = await http_client.fetch(url, headers=request_headers)
+    logger.info("上游請求", extra={'upstream': url, 'latency_ms': round((time.perf_counter() - started) * 1000),
+                                   'cache': 'not_modified' if data is None else 'refresh'})
+    if data is None:
+        write = _persist(cache_store.touch, url)
+    else:
+        etag, last_modified = response_headers.get('ETag'), response_headers.get('Last-Modified')
+        _validators[url] = (etag, last_modified)
+        write = _persist(cache_store.save, url, data, etag, last_modified)
+    if shared_cache.backend.shared:
+        # 其他進程靠快照讀資料，寫完先放租約
+        await write
+    return cached if data is None else data, response_headers
+
+# 多進程模式：先睇其他進程 max_age 秒內攞過未；同一 URL 同一時間只有一個進程去上游
+async def _fetch_shared(url: str, fetch, max_age: float) -> dict:
+    backend = shared_cache.backend
+    if not backend.shared:
+        return await fetch()
+    while True:
+        hit = await backend.lookup(url, max_age)
+        if hit is not None:
+            data, age, etag, last_modified = hit
+            _validators[url] = (etag, last_modified)
+            metrics.increment('shared_cache_hits')
+            return data
+        if await backend.claim(url):
+            try:
+                return await fetch()
+            finally:
+                await backend.release(url)
+        await asyncio.sleep(SHARED_POLL_INTERVAL)
+
+# 所有進程共用 football-data 配額；單一進程模式即刻返回
+async def _acquire_shared_quota():
+    deadline = time.monotonic() + QUOTA_WAIT_TIMEOUT
+    while True:
+        wait = await shared_cache.backend.take_token('football', FOOTBALL_RATE_PER_MINUTE)
+        if wait <= 0:
+            return
+        if time.monotonic() + wait > deadline:
+            raise rate_limiter.RateLimited(f"等候共用配額超過 {QUOTA_WAIT_TIMEOUT} 秒")
+        await asyncio.sleep(wait)
+
+def _reset_seconds(headers) -> float:
+    try:
+        return float(headers.get('X-RequestCounter-Reset', 60))
+    except (TypeError, ValueError):
+        return 60.0
+
+async def _fetch_ergast(url: str) -> dict:
+    data, _ = await _fetch_conditional(url)
+    return data
+
+# 經配額排程器請求 football-data.org；遇到 429 就排隊等重置再試
+async def _fetch_football(url: str, priority: int) -> dict:
+    headers = {'X-Auth-Token': os.getenv('FOOTBALL_API_KEY')}
+    for attempt in range(2):
+        await football_quota.acquire(priority, timeout=QUOTA_WAIT_TIMEOUT)
+        await _acquire_shared_quota()
+        try:
+            data, response_headers = await _fetch_conditional(url, headers=headers)
+        except aiohttp.ClientResponseError as e:
+            if e.status != 429 or attempt == 1:
+                raise
+            football_quota.update_from_headers(e.headers or {}, status=429)
+            await shared_cache.backend.block('football', _reset_seconds(e.headers or {}))
+            continue
+        football_quota.update_from_headers(response_headers)
+        return data
+
+def _log_lookup(url: str):
+    if logger.isEnabledFor(logging.DEBUG):
+        age = response_cache.age(url)
+        state = 'miss' if age is None else 'hit' if age < ttl_for(url) else 'stale'
+        logger.debug("快取查詢", extra={'upstream': url, 'cache': state})
+
+# 足球數據（football-data.org），path 例如 'competitions/PL/standings'
+async def get_football(path: str, priority: Optional[int] = None) -> dict:
+    url = FOOTBALL_API_BASE + path
+    cached = response_cache.peek(url)
+    if priority is None:
+        # 有舊資料可用嘅更新唔使同互動請求爭配額
+        priority = rate_limiter.PRIORITY_BACKGROUND if cached is not None else rate_limiter.PRIORITY_INTERACTIVE
+    _log_lookup(url)
+    try:
+        return await response_cache.get(url, lambda: _fetch_shared(url, lambda: _fetch_football(url, priority), ttl_for(url)), ttl_for(url))
+    except (rate_limiter.RateLimited, aiohttp.ClientResponseError) as e:
+        if cached is None or (isinstance(e, aiohttp.ClientResponseError) and e.status != 429):
+            raise
+        logger.warning(f"配額不足，改用快取資料: {url}")
+        return cached
+
+# F1數據（Ergast / jolpi.ca），path 例如 'current.json'
+async def get_ergast(path: str) -> dict:
+    url = ERGAST_API_BASE + path
+    _log_lookup(url)
+    return await response_cache.get(url, lambda: _fetch_shared(url, lambda: _fetch_ergast(url), ttl_for(url)), ttl_for(url))
+
+# response_cache 已淘汰或者換咗資料嘅 URL 唔再保留索引同版本，記憶體跟快取上限走
+def _prune_parsed():
+    for table in (_parsed, _versions):
+        for url in [url for url, (data, _) in table.items() if response_cache.peek(url) is not data]:
+            del table[url]
+
+def _index_for(url: str, data: dict, build):
+    entry = _parsed.get(url)
+    if entry is not None and entry[0] is data:
+        return entry[1]
+    _prune_parsed()
+    with metrics.timer(f"parse {build.__qualname__.split('.')[0]}"):
+        index = build(data)
+    _parsed[url] = (data, index)
+    return index
+
+# 已解析嘅足球比賽索引
+async def get_match_index(path: str) -> MatchIndex:
+    data = await get_football(path)
+    return _index_for(FOOTBALL_API_BASE + path, data, MatchIndex.from_payload)
+
+# 已解析嘅足球積分榜
+async def get_standings(competition: str) -> list:
+    path = f"competitions/{competition}/standings"
+    data = await get_football(path)
+    return _index_for(FOOTBALL_API_BASE + path, data, Standing.from_payload)
+
+# 已解析嘅F1賽季索引
+async def get_race_index(path: str = 'current.json') -> RaceIndex:
+    data = await get_ergast(path)
+    return _index_for(ERGAST_API_BASE + path, data, RaceIndex.from_payload)
+
+# 已解析嘅F1車手積分榜
+async def get_driver_standings(path: str = 'current/driverStandings.json') -> list:
+    data = await get_ergast(path)
+    return _index_for(ERGAST_API_BASE + path, data, DriverStanding.from_payload)
+
+# 已解析資料嘅內容版本（渲染快取用）；parsed 唔係最新嗰份就返回 None
+def data_version(source: str, path: str, parsed) -> Optional[str]:
+    url = _url(source, path)
+    entry = _parsed.get(url)
+    if entry is None or entry[1] is not parsed:
+        return None
+    cached = _versions.get(url)
+    if cached is not None and cached[0] is entry[0]:
+        return cached[1]
+    digest = hashlib.sha1(json.dumps(entry[0], sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+    _versions[url] = (entry[0], digest)
+    return digest
+
+# 已解析資料入面見過嘅球隊：team_id -> 名
+def known_teams() -> dict:
+    # 未解析過嘅足球資料（例如由快照載入）順便解析；已淘汰嘅資料集唔再計
+    _prune_parsed()
+    for url in response_cache.keys():
+        if url.startswith(FOOTBALL_API_BASE) and url not in _parsed:
+            build = Standing.from_payload if '/standings' in url else MatchIndex.from_payload
+            _index_for(url, response_cache.peek(url), build)
+    teams = {}
+    for _, index in _parsed.values():
+        if isinstance(index, MatchIndex):
+            for match in index.all.items:
+                teams[match.home_id] = match.home
+                teams[match.away_id] = match.away
+        elif isinstance(index, list):
+            for row in index:
+                if isinstance(row, Standing):
+                    teams[row.team_id] = row.short_name
+    teams.pop(None, None)
+    return teams
+
+# 背景預取：強制更新快取，ttl 由呼叫者按輪詢間隔決定
+# 多進程模式下其他進程 max_age 秒內已經攞過就直接用，唔會每個進程各自輪詢上游
+async def refresh_football(path: str, ttl: float, max_age: float = 0.0) -> dict:
+    url = FOOTBALL_API_BASE + path
+    return await response_cache.refresh(
+        url, lambda: _fetch_shared(url, lambda: _fetch_football(url, rate_limiter.PRIORITY_BACKGROUND), max_age), ttl)
+
+async def refresh_ergast(path: str, ttl: float, max_age: float = 0.0) -> dict:
+    url = ERGAST_API_BASE + path
+    return await response_cache.refresh(url, lambda: _fetch_shared(url, lambda: _fetch_ergast(url), max_age), ttl)
+
+def _url(source: str, path: str) -> str:
+    return (FOOTBALL_API_BASE if source == 'football' else ERGAST_API_BASE) + path
+
+# 快取資料幾耐之前攞（秒）
+def cache_age(source: str, path: str) -> Optional[float]:
+    return response_cache.age(_url(source, path))
+
+# 唔理過期與否直接攞快取資料，冇就返回 None
+def peek(source: str, path: str) -> Optional[dict]:
+    return response_cache.peek(_url(source, path))
+
+# 同上，但返回已解析嘅比賽索引
+def peek_match_index(path: str) -> Optional[MatchIndex]:
+    data = peek('football', path)
+    return None if data is None else _index_for(FOOTBALL_API_BASE + path, data, MatchIndex.from_payload)
+
+def cache_stats() -> dict:
+    return response_cache.stats()
+
+def quota_stats() -> dict:
+    return football_quota.stats()
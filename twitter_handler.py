@@ -3,20 +3,61 @@ import re
 from typing import List, Optional
 import logging
 import asyncio
+import time
 from discord.ui import Button, View
 
-# 設置日誌
+import metrics
+import render
+from cache import TTLCache
+
+# 設置日誌（寫檔由 log_setup 統一處理）
 logger = logging.getLogger('twitter_handler')
-logger.setLevel(logging.INFO)
-handler = logging.FileHandler('bot.log')
-handler.setFormatter(logging.Formatter('%(asctime)s: %(levelname)s: %(name)s: %(message)s'))
-logger.addHandler(handler)
 
-# 提取 x.com 或 twitter.com 連結
+# 預先編譯嘅連結格式
+X_LINK_PATTERN = re.compile(r'https?://(?:www\.)?(x|twitter)\.com/(\w+/status/\d+)(?:\?\S*)?', re.IGNORECASE)
+# 由回覆內容（任何 fixupx 子域名）讀返推文路徑
+FIXUPX_PATH_PATTERN = re.compile(r'fixupx\.com/(\w+/status/\d+)', re.IGNORECASE)
+# 一個回覆最多幾多條連結有按鈕（每條連結一行，Discord 最多5行）
+MAX_VIEW_LINKS = 5
+# 同一頻道兩次回覆之間最少相隔（秒）
+REPLY_INTERVAL = 1.0
+
+# 同一頻道幾多秒內重複貼同一條連結唔再回覆
+DEDUP_WINDOW = 60
+# 已計算嘅 fixupx 連結保留幾耐
+VARIANT_TTL = 3600
+
+# 頻道 -> 最近一個已預留嘅回覆時間（monotonic）
+_last_reply = TTLCache(maxsize=1024)
+# 正規化路徑 -> {'': 連結, 'g': Gallery, 'd': Download}
+_variants = TTLCache(maxsize=2048)
+# 訊息內容 -> 連結，同一段文字被大量轉貼時唔使再行 regex
+_extracted = TTLCache(maxsize=1024)
+# (頻道, 正規化路徑) -> 最近已回覆
+_recent_links = TTLCache(maxsize=4096)
+
+# 快速篩選：冇 x.com / twitter.com 字眼就唔使行 regex
+def might_contain_x_link(message: str) -> bool:
+    lowered = message.lower()
+    return 'x.com' in lowered or 'twitter.com' in lowered
+
+# 推文路徑正規化：細階、唔包括 query string，例如 'user/status/123'
+def normalise_path(link: str) -> str:
+    return X_LINK_PATTERN.match(link).group(2).lower()
+
+# 提取 x.com 或 twitter.com 連結（同一訊息重複嘅推文只保留一次）
 async def extract_x_links(message: str) -> List[str]:
-    pattern = r'https?://(?:www\.)?(x|twitter)\.com/(\w+/status/\d+)(?:\?\S*)?'
-    links = re.findall(pattern, message, re.IGNORECASE)
-    return [f"https://{domain}.com/{path}" for domain, path in links]
+    if not might_contain_x_link(message):
+        return []
+    cached = _extracted.get_fresh(message)
+    if cached is not None:
+        return list(cached)
+    links = {}
+    for domain, path in X_LINK_PATTERN.findall(message):
+        links.setdefault(path.lower(), f"https://{domain}.com/{path}")
+    result = tuple(links.values())
+    _extracted.set(message, result, VARIANT_TTL)
+    return list(result)
 
 # 將 x.com/twitter.com 轉為 fixupx.com 子域名
 def replace_to_fixupx(url: str, subdomain: str = '') -> str:
@@ -25,29 +66,100 @@ def replace_to_fixupx(url: str, subdomain: str = '') -> str:
         return base.replace('fixupx.com', f'{subdomain}.fixupx.com')
     return base
 
-# 按鈕視圖類
+# 三種 fixupx 連結，同一推文只計一次；由標準 x.com 網址生成，唔受原連結大細階或域名影響
+def fixupx_variants(link: str) -> dict:
+    key = normalise_path(link)
+    variants = _variants.get_fresh(key)
+    if variants is None:
+        canonical = f"https://x.com/{X_LINK_PATTERN.match(link).group(2)}"
+        variants = {subdomain: replace_to_fixupx(canonical, subdomain) for subdomain in ('', 'g', 'd')}
+        _variants.set(key, variants, VARIANT_TTL)
+    return variants
+
+# 將回覆入面第 index 行換成新連結
+def _replace_line(content: str, index: int, new_url: str) -> str:
+    lines = content.split('\n')
+    if index < len(lines):
+        lines[index] = new_url
+    return '\n'.join(lines)
+
+# 子域名代號：g=Gallery, d=Download, o=Origin
+SUBDOMAINS = {'g': 'g', 'd': 'd', 'o': ''}
+LINK_BUTTONS = [('Gallery', 'g'), ('Download', 'd'), ('Origin', 'o')]
+
+# 連結按鈕：custom_id 'tw:<代號>:<行號>:<用戶>/status/<id>' 已包含所需資料，唔使每個訊息保留狀態
+class TweetLinkButton(discord.ui.DynamicItem[Button], template=r'tw:(?P<action>[gdo]):(?P<row>\d):(?P<path>\w+/status/\d+)'):
+    def __init__(self, action: str, row: int, path: str, label: Optional[str] = None):
+        super().__init__(Button(
+            label=label or action,
+            style=discord.ButtonStyle.secondary,
+            custom_id=f"tw:{action}:{row}:{path}",
+            row=row,
+        ))
+        self.action = action
+        self.row = row
+        self.path = path
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(match['action'], int(match['row']), match['path'], item.label)
+
+    async def callback(self, interaction: discord.Interaction):
+        fixupx_url = fixupx_variants(f"https://x.com/{self.path}")[SUBDOMAINS[self.action]]
+        logger.debug(f"更新回覆為 {self.item.label} 連結: {fixupx_url}")
+        await interaction.response.edit_message(content=_replace_line(interaction.message.content, self.row, fixupx_url))
+
+# 刪除按鈕
+class TweetDeleteButton(discord.ui.DynamicItem[Button], template=r'tw:del'):
+    def __init__(self):
+        super().__init__(Button(label="Delete", style=discord.ButtonStyle.danger, custom_id="tw:del", row=0))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls()
+
+    async def callback(self, interaction: discord.Interaction):
+        logger.debug("刪除回覆訊息")
+        await interaction.response.defer()
+        await interaction.message.delete()
+
+# 建立回覆用嘅按鈕（全部係 DynamicItem，discord.py 唔會為每個訊息儲存視圖）
+def build_tweet_view(links: List[str]) -> View:
+    view = View(timeout=None)
+    links = links[:MAX_VIEW_LINKS]
+    numbered = len(links) > 1
+    for row, link in enumerate(links):
+        path = X_LINK_PATTERN.match(link).group(2)
+        for label, action in LINK_BUTTONS:
+            view.add_item(TweetLinkButton(action, row, path, f"{label} {row + 1}" if numbered else label))
+    view.add_item(TweetDeleteButton())
+    return view
+
+# 舊版回覆嘅固定 custom_id 按鈕：啟動時用 bot.add_view 登記一次，連結由訊息內容讀返
 class TweetView(discord.ui.View):
-    def __init__(self, original_url: str, timeout: float = 600.0):
-        super().__init__(timeout=timeout)
-        self.original_url = original_url
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    async def _edit_link(self, interaction: discord.Interaction, label: str, subdomain: str):
+        found = FIXUPX_PATH_PATTERN.search(interaction.message.content)
+        if not found:
+            await interaction.response.defer()
+            return
+        fixupx_url = replace_to_fixupx(f"https://x.com/{found.group(1)}", subdomain)
+        logger.debug(f"更新回覆為 {label} 連結: {fixupx_url}")
+        await interaction.response.edit_message(content=fixupx_url)
 
     @discord.ui.button(label="Gallery", style=discord.ButtonStyle.secondary, custom_id="gallery_button")
     async def gallery_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        fixupx_url = replace_to_fixupx(self.original_url, 'g')
-        logger.debug(f"更新回覆為 Gallery 連結: {fixupx_url}")
-        await interaction.response.edit_message(content=fixupx_url)
+        await self._edit_link(interaction, "Gallery", 'g')
 
     @discord.ui.button(label="Download", style=discord.ButtonStyle.secondary, custom_id="download_button")
     async def download_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        fixupx_url = replace_to_fixupx(self.original_url, 'd')
-        logger.debug(f"更新回覆為 Download 連結: {fixupx_url}")
-        await interaction.response.edit_message(content=fixupx_url)
+        await self._edit_link(interaction, "Download", 'd')
 
     @discord.ui.button(label="Origin", style=discord.ButtonStyle.secondary, custom_id="origin_button")
     async def origin_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        fixupx_url = replace_to_fixupx(self.original_url)
-        logger.debug(f"更新回覆為 Origin 連結: {fixupx_url}")
-        await interaction.response.edit_message(content=fixupx_url)
+        await self._edit_link(interaction, "Origin", '')
 
     @discord.ui.button(label="Delete", style=discord.ButtonStyle.danger, custom_id="delete_button")
     async def delete_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -55,35 +167,52 @@ class TweetView(discord.ui.View):
         await interaction.response.defer()
         await interaction.message.delete()
 
-# 主處理函數
+# 啟動時登記按鈕處理（重啟後舊訊息嘅按鈕照樣用得）
+def register_views(client: discord.Client):
+    client.add_dynamic_items(TweetLinkButton, TweetDeleteButton)
+    client.add_view(TweetView())
+
+# 同一頻道回覆之間保持間距，避免觸發速率限制；先預留時段再等，並發訊息會順序排隊
+async def _throttle(channel_id: int):
+    now = time.monotonic()
+    last = _last_reply.peek(channel_id)
+    slot = now if last is None else max(now, last + REPLY_INTERVAL)
+    _last_reply.set(channel_id, slot, slot - now + REPLY_INTERVAL)
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
+# 主處理函數：每個訊息最多壓制一次嵌入、合併成一個回覆（超過 Discord 字數上限就分頁，按鈕跟第一頁）
 async def process_x_links(message: discord.Message) -> List[dict]:
+    if not might_contain_x_link(message.content):
+        return []
     links = await extract_x_links(message.content)
     if not links:
         logger.debug("無 x.com 或 twitter.com 連結")
         return []
-    
-    results = []
+
+    # 同一頻道短時間內重複貼嘅連結唔再回覆
+    channel_id = message.channel.id
+    links = [link for link in links if _recent_links.get_fresh((channel_id, normalise_path(link))) is None]
+    if not links:
+        logger.debug("重複連結，略過")
+        return []
     for link in links:
-        logger.debug(f"發現連結: {link}")
-        fixupx_url = replace_to_fixupx(link)
-        view = TweetView(link)
-        
-        # 壓制原始嵌入
-        try:
-            await message.edit(suppress=True)
-        except discord.errors.Forbidden:
-            logger.error("無法壓制原始嵌入：缺少 manage_messages 權限")
-        except Exception as e:
-            logger.error(f"無法壓制原始嵌入: {str(e)}")
-        
-        results.append({
-            'type': 'reply',
-            'result': {
-                'content': fixupx_url,
-                'view': view
-            }
-        })
-        # 添加延遲避免速率限制
-        await asyncio.sleep(0.5)
-    
-    return results
\ No newline at end of file
+        _recent_links.set((channel_id, normalise_path(link)), True, DEDUP_WINDOW)
+
+    started = time.perf_counter()
+    logger.debug(f"發現 {len(links)} 條連結: {links}")
+    # 壓制原始嵌入
+    try:
+        await message.edit(suppress=True)
+    except discord.errors.Forbidden:
+        logger.error("無法壓制原始嵌入：缺少 manage_messages 權限")
+    except Exception as e:
+        logger.error(f"無法壓制原始嵌入: {str(e)}")
+
+    metrics.observe('x_links.process', time.perf_counter() - started)
+    await _throttle(channel_id)
+    logger.debug(f"連結處理用時 {(time.perf_counter() - started) * 1000:.1f}ms")
+    pages = render.paginate([f"{fixupx_variants(link)['']}\n" for link in links])
+    results = [{'type': 'reply', 'result': {'content': page.rstrip('\n')}} for page in pages]
+    results[0]['result']['view'] = build_tweet_view(links)
+    return results